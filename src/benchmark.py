@@ -0,0 +1,259 @@
+import os
+import sys
+import copy
+import json
+import time
+import getopt
+import platform
+import subprocess
+from generate_configuration import shape_config
+from build_pool import BuildJob, run_jobs
+
+# Times full builds of a fixed set of configurations with every engine.  Every build runs in its own process
+# with trace_build on, the per stage times come from the <case>_trace.json it writes (see build_trace.py).
+# Each run is appended to a history file and can be compared against a saved baseline run.
+#
+# run from the repository root:
+#   python src/benchmark.py [--engines=solid,cadquery,manifold] [--only=<text in case name>] [--jobs=1] [--timeout=seconds]
+#                           [--bench_dir=things/benchmarks] [--baseline=<baseline json>] [--save_baseline]
+#                           [--threshold=0.1] [--min_seconds=0.25]
+
+# the key grid with the default thumb, then every thumb cluster on one grid
+key_grid = [
+    [4, 5],
+    [5, 6],
+    [6, 6],
+]
+plate_styles = ["NOTCH", "HS_NOTCH"]
+thumb_styles = [
+    "DEFAULT", "MINI", "CARBONFET", "MINIDOX", "TRACKBALL_ORBYL", "TRACKBALL_WILD", "TRACKBALL_CJ", "TRACKBALL_BTU"
+]
+thumb_grid = [5, 6]
+engines = ["solid", "cadquery", "manifold"]
+
+# stages reported for every case, the names written by make_dactyl's tracer
+stage_names = [
+    "key_holes_right", "connectors_right", "thumb_right", "thumb_connectors_right", "case_walls_right",
+    "model_side_right", "baseplate_right", "export_right", "export_right_plate", "run",
+]
+
+
+def benchmark_cases():
+    cases = []
+    for rows, cols in key_grid:
+        for plate in plate_styles:
+            cases.append({"nrows": rows, "ncols": cols, "plate_style": plate, "thumb_style": "DEFAULT"})
+    for thumb in thumb_styles[1:]:
+        cases.append({"nrows": thumb_grid[0], "ncols": thumb_grid[1], "plate_style": "NOTCH", "thumb_style": thumb})
+    return cases
+
+
+def case_name(case, engine):
+    return "{}_x_{}_{}_{}_{}".format(case["nrows"], case["ncols"], case["plate_style"], case["thumb_style"], engine)
+
+
+def make_config(case, engine, bench_dir):
+    config = copy.deepcopy(shape_config)
+    config.update(case)
+    name = case_name(case, engine)
+    config["ENGINE"] = engine
+    config["other_thumb"] = "DEFAULT"
+    config["ball_side"] = "both"
+    config["overrides"] = ""
+    config["save_dir"] = os.path.join(bench_dir, "builds", name)
+    config["save_name"] = name
+    # measure the build itself, no reuse between runs and no forked halves
+    config["show_caps"] = False
+    config["quick_render"] = False
+    config["stage_cache"] = False
+    config["parallel_sides"] = False
+    config["trace_build"] = True
+    config["trace_profile"] = False
+    return name, config
+
+
+def benchmark_jobs(bench_dir, engine_list=None, only=None):
+    jobs = []
+    for engine in (engine_list or engines):
+        for case in benchmark_cases():
+            name, config = make_config(case, engine, bench_dir)
+            if only is not None and only not in name:
+                continue
+            jobs.append(BuildJob(name, config, log_file=os.path.join(bench_dir, "logs", name + ".log")))
+    return jobs
+
+
+def read_trace(job):
+    trace_file = os.path.join(job.config["save_dir"], job.config["save_name"] + "_trace.json")
+    if not os.path.exists(trace_file):
+        return {}
+    with open(trace_file, mode='r') as fid:
+        trace = json.load(fid)
+
+    stages = {}
+    for record in trace["stages"]:
+        if record["name"] in stage_names:
+            # a stage can run more than once in a build, report the total
+            stages[record["name"]] = round(stages.get(record["name"], 0.) + record["wall_s"], 4)
+    return {"stages": stages, "peak_rss_mb": trace.get("peak_rss_mb")}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def collect_results(jobs, manifest):
+    results = {}
+    for job in jobs:
+        result = {"status": job.status, "seconds": job.seconds}
+        if job.status == "ok":
+            result.update(read_trace(job))
+        results[job.name] = result
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "workers": manifest["workers"],
+        "seconds": manifest["seconds"],
+        "cases": results,
+    }
+
+
+def append_history(history_file, run):
+    # one json run per line, the whole history stays readable with a line by line json reader
+    with open(history_file, mode='a') as fid:
+        fid.write(json.dumps(run, sort_keys=True) + "\n")
+    print("HISTORY APPENDED TO {}".format(history_file))
+
+
+def case_metrics(result):
+    metrics = {"total": result.get("seconds")}
+    metrics.update(result.get("stages", {}))
+    return metrics
+
+
+def compare_runs(baseline, run, threshold=0.1, min_seconds=0.25):
+    # a metric regresses when it is slower by more than threshold (relative) and min_seconds (absolute),
+    # the absolute floor keeps sub second stages from flagging on noise
+    regressions = []
+    improvements = []
+    for name, result in sorted(run["cases"].items()):
+        base_result = baseline["cases"].get(name)
+        if base_result is None or base_result.get("status") != "ok":
+            continue
+        if result.get("status") != "ok":
+            regressions.append({"case": name, "metric": "status", "baseline": "ok", "current": result.get("status")})
+            continue
+
+        base_metrics = case_metrics(base_result)
+        for metric, current in case_metrics(result).items():
+            previous = base_metrics.get(metric)
+            if previous in [None, 0] or current is None:
+                continue
+            change = (current - previous) / previous
+            entry = {"case": name, "metric": metric, "baseline": previous, "current": current, "change": round(change, 4)}
+            if change > threshold and current - previous > min_seconds:
+                regressions.append(entry)
+            elif change < -threshold and previous - current > min_seconds:
+                improvements.append(entry)
+
+    return regressions, improvements
+
+
+def print_comparison(regressions, improvements):
+    for entry in improvements:
+        print("FASTER {case} {metric}: {baseline:.2f}s -> {current:.2f}s ({change:+.0%})".format(**entry))
+    for entry in regressions:
+        if entry["metric"] == "status":
+            print("REGRESSION {case}: {current} (baseline ok)".format(**entry))
+        else:
+            print("REGRESSION {case} {metric}: {baseline:.2f}s -> {current:.2f}s ({change:+.0%})".format(**entry))
+    print("COMPARISON: {} regressions, {} improvements".format(len(regressions), len(improvements)))
+
+
+def usage():
+    print("usage: python src/benchmark.py [--engines=solid,cadquery,manifold] [--only=<text>] [--jobs=N] [--timeout=seconds]"
+          " [--bench_dir=<dir>] [--baseline=<file>] [--save_baseline] [--threshold=0.1] [--min_seconds=0.25]")
+    sys.exit(-1)
+
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "", [
+            "engines=", "only=", "jobs=", "timeout=", "bench_dir=", "baseline=", "save_baseline", "threshold=",
+            "min_seconds=",
+        ])
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+
+    engine_list = None
+    only = None
+    # one build at a time by default, parallel builds compete for the cpu and skew the times
+    workers = 1
+    timeout = None
+    bench_dir = os.path.join("things", "benchmarks")
+    baseline_file = None
+    save_baseline = False
+    threshold = 0.1
+    min_seconds = 0.25
+    for opt, arg in opts:
+        if opt == '--engines':
+            engine_list = arg.split(",")
+        elif opt == '--only':
+            only = arg
+        elif opt == '--jobs':
+            workers = int(arg)
+        elif opt == '--timeout':
+            timeout = float(arg)
+        elif opt == '--bench_dir':
+            bench_dir = arg
+        elif opt == '--baseline':
+            baseline_file = arg
+        elif opt == '--save_baseline':
+            save_baseline = True
+        elif opt == '--threshold':
+            threshold = float(arg)
+        elif opt == '--min_seconds':
+            min_seconds = float(arg)
+
+    if baseline_file is None:
+        baseline_file = os.path.join(bench_dir, "baseline.json")
+
+    os.makedirs(bench_dir, exist_ok=True)
+    jobs = benchmark_jobs(bench_dir, engine_list, only)
+    if not jobs:
+        print("NO BENCHMARK CASES SELECTED")
+        usage()
+
+    manifest = run_jobs(jobs, workers=workers, manifest_file=os.path.join(bench_dir, "benchmark_manifest.json"),
+                        timeout=timeout)
+    run = collect_results(jobs, manifest)
+    append_history(os.path.join(bench_dir, "history.jsonl"), run)
+
+    for name, result in sorted(run["cases"].items()):
+        print("{:<45} {:>8} {}".format(name, result["status"], result["seconds"]))
+
+    failed = False
+    if os.path.exists(baseline_file):
+        with open(baseline_file, mode='r') as fid:
+            baseline = json.load(fid)
+        print("COMPARING WITH BASELINE {} ({})".format(baseline_file, baseline.get("revision")))
+        regressions, improvements = compare_runs(baseline, run, threshold, min_seconds)
+        print_comparison(regressions, improvements)
+        failed = len(regressions) > 0
+
+    if save_baseline:
+        with open(baseline_file, mode='w') as fid:
+            json.dump(run, fid, indent=2, sort_keys=True)
+        print("BASELINE WRITTEN TO {}".format(baseline_file))
+
+    sys.exit(1 if failed or manifest["failed"] > 0 else 0)
@@ -0,0 +1,209 @@
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+
+
+# one build = one config dict, built by make_dactyl in a fresh worker process so the module globals it
+# writes, and any crash in the geometry kernel, stay inside that job
+class BuildJob(object):
+    def __init__(self, name, config, log_file=None):
+        self.name = name
+        self.config = config
+        self.log_file = log_file
+        self.status = "pending"
+        self.error = None
+        self.artifacts = None
+        self.seconds = None
+        self.attempts = 0
+        self.start_time = None
+        self.process = None
+        self.connection = None
+        self.result = None
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "status": self.status,
+            "seconds": self.seconds,
+            "attempts": self.attempts,
+            "error": self.error,
+            "artifacts": self.artifacts,
+            "log_file": self.log_file,
+            "save_dir": self.config.get("save_dir"),
+            "save_name": self.config.get("save_name"),
+            "ENGINE": self.config.get("ENGINE"),
+        }
+
+
+def build_dactyl(config):
+    import dactyl_manuform
+    return dactyl_manuform.make_dactyl(config)
+
+
+def run_job(connection, config, log_file):
+    if log_file is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        log = open(log_file, mode='w')
+        sys.stdout = log
+        sys.stderr = log
+    try:
+        connection.send({"artifacts": build_dactyl(config)})
+    except BaseException:
+        # SystemExit included
+        traceback.print_exc()
+        connection.send(traceback.format_exc())
+    finally:
+        sys.stdout.flush()
+        connection.close()
+
+
+def start_job(job):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    job.process = multiprocessing.Process(target=run_job, args=(sender, job.config, job.log_file), name=job.name)
+    job.connection = receiver
+    job.result = None
+    job.status = "running"
+    job.error = None
+    job.attempts += 1
+    job.start_time = time.time()
+    job.process.start()
+    sender.close()
+    print("STARTED {} (attempt {})".format(job.name, job.attempts))
+
+
+def receive_result(job):
+    # read as soon as the worker sends, a result larger than the pipe buffer blocks the worker until it is read
+    try:
+        job.result = job.connection.recv()
+    except EOFError:
+        job.result = None  # closed without a result
+    job.connection.close()
+    job.connection = None
+
+
+def finish_job(job):
+    if job.connection is not None:
+        if job.connection.poll():
+            receive_result(job)
+        else:
+            job.connection.close()
+            job.connection = None
+    job.process.join()
+
+    # the paths written on success, the traceback on failure
+    error = None
+    if isinstance(job.result, dict):
+        job.artifacts = job.result["artifacts"]
+    else:
+        error = job.result
+    job.seconds = round(time.time() - job.start_time, 2)
+
+    if job.process.exitcode != 0 and error is None:
+        error = "worker exited with code {}".format(job.process.exitcode)
+    if error is None:
+        job.status = "ok"
+        print("FINISHED {} in {}s".format(job.name, job.seconds))
+    else:
+        job.status = "failed"
+        job.error = error
+        print("FAILED {} after {}s".format(job.name, job.seconds))
+
+
+def stop_job(job):
+    job.process.terminate()
+    job.process.join(5)
+    if job.process.is_alive():
+        job.process.kill()
+        job.process.join()
+    if job.connection is not None:
+        job.connection.close()
+        job.connection = None
+    job.seconds = round(time.time() - job.start_time, 2)
+    job.status = "timeout"
+    job.error = "no result after {}s".format(job.seconds)
+    print("TIMED OUT {} after {}s".format(job.name, job.seconds))
+
+
+def run_jobs(jobs, workers=None, manifest_file=None, timeout=None, retries=0):
+    # timeout is per attempt in seconds, a job that fails or times out is queued again up to retries times
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, workers)
+
+    pending = list(jobs)
+    running = []
+    start_time = time.time()
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.pop(0)
+            start_job(job)
+            running.append(job)
+
+        wait_time = None
+        if timeout is not None:
+            wait_time = max(0., min(job.start_time + timeout for job in running) - time.time())
+
+        # a worker's sentinel becomes ready when its process exits, however it exits, and its connection when it
+        # sends its result
+        waiting = [job.process.sentinel for job in running]
+        waiting += [job.connection for job in running if job.connection is not None]
+        ready = wait(waiting, timeout=wait_time)
+        for job in list(running):
+            if job.connection is not None and job.connection in ready:
+                receive_result(job)
+            if job.process.sentinel in ready:
+                finish_job(job)
+            elif timeout is not None and time.time() - job.start_time >= timeout:
+                stop_job(job)
+            else:
+                continue
+
+            running.remove(job)
+            if job.status != "ok" and job.attempts <= retries:
+                print("RETRYING {}".format(job.name))
+                pending.append(job)
+
+    manifest = {
+        "workers": workers,
+        "seconds": round(time.time() - start_time, 2),
+        "ok": len([job for job in jobs if job.status == "ok"]),
+        "failed": len([job for job in jobs if job.status in ["failed", "timeout"]]),
+        "jobs": [job.summary() for job in jobs],
+    }
+    if manifest_file is not None:
+        with open(manifest_file, mode='w') as fid:
+            json.dump(manifest, fid, indent=2)
+        print("MANIFEST WRITTEN TO {}".format(manifest_file))
+
+    return manifest
+
+
+def fork_available():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def run_forked(tasks):
+    # tasks are (name, function) pairs run side by side in forked processes, they share the caller's state
+    # through the fork so nothing is pickled, and each task exports its own results
+    context = multiprocessing.get_context('fork')
+    processes = []
+    for name, task in tasks:
+        process = context.Process(target=task, name=name)
+        process.start()
+        print("STARTED {}".format(name))
+        processes.append(process)
+
+    failed = []
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            failed.append(process.name)
+        else:
+            print("FINISHED {}".format(process.name))
+
+    if failed:
+        raise RuntimeError("parallel build tasks failed: {}".format(", ".join(failed)))
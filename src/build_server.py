@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import time
+import getopt
+import importlib
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from build_pool import BuildJob, run_jobs, fork_available
+from generate_configuration import shape_config
+from dactyl_config import DactylConfig
+
+# Long running build server.  cadquery / OCP, numpy and scipy are imported once at start up and stay loaded, the
+# thumb cluster modules load on the first build that uses them and stay loaded too, so a build request only pays
+# for the build itself.  Builds run one at a time under a lock, in this process by default so the imported part
+# caches stay warm across builds, or with --isolate in a forked worker per build, which still starts from the
+# loaded modules but keeps a crash in the geometry kernel out of the server.
+#
+# run from the repository root:
+#   python src/build_server.py [--host=127.0.0.1] [--port=8765] [--engines=cadquery] [--isolate] [--timeout=seconds]
+#
+#   GET  /status  ->  {"busy": false, "builds": 3, ...}
+#   POST /build   <-  config document, the settings to change from src/run_config.json, or {"config": {...}}
+#                 ->  {"status": "ok", "seconds": 31.2, "artifacts": ["/abs/path/5x6_right.step", ...],
+#                      "config": "<digest>", "changed": ["nrows", ...]}   settings changed since the last build
+
+run_config = os.path.join("src", "run_config.json")
+
+
+class BuildServer(object):
+    def __init__(self, base_config, isolate=False, timeout=None):
+        self.base_config = base_config
+        self.isolate = isolate
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.builds = 0
+        self.failed = 0
+        self.busy = None
+        self.last_config = None
+
+    def status(self):
+        return {
+            "busy": self.busy is not None,
+            "current": self.busy,
+            "builds": self.builds,
+            "failed": self.failed,
+            "isolate": self.isolate,
+            "uptime": round(time.time() - self.start_time, 1),
+            "pid": os.getpid(),
+        }
+
+    def config(self, document):
+        settings = document.get("config", document)
+        if not isinstance(settings, dict):
+            raise ValueError("config must be a json object of settings")
+        return DactylConfig(shape_config, self.base_config, settings)
+
+    def build(self, config):
+        with self.lock:
+            self.builds += 1
+            name = "build_{}".format(self.builds)
+            self.busy = name
+            start_time = time.time()
+            try:
+                if self.isolate:
+                    result = self.build_isolated(name, config)
+                else:
+                    result = self.build_here(config)
+            finally:
+                self.busy = None
+            result["seconds"] = round(time.time() - start_time, 2)
+            result["config"] = config.digest
+            if self.last_config is not None:
+                result["changed"] = sorted(config.diff(self.last_config))
+            self.last_config = config
+            if result["status"] != "ok":
+                self.failed += 1
+            print("{} {} in {}s".format(name.upper(), result["status"].upper(), result["seconds"]))
+            return result
+
+    def build_here(self, config):
+        import dactyl_manuform
+        try:
+            return {"status": "ok", "artifacts": dactyl_manuform.make_dactyl(config)}
+        except BaseException:
+            # SystemExit included, the server outlives a build that calls exit
+            traceback.print_exc()
+            return {"status": "failed", "error": traceback.format_exc()}
+
+    def build_isolated(self, name, config):
+        job = BuildJob(name, config.settings())
+        run_jobs([job], workers=1, timeout=self.timeout)
+        result = {"status": job.status, "artifacts": job.artifacts}
+        if job.error is not None:
+            result["error"] = job.error
+        return result
+
+
+def make_handler(server):
+    class BuildHandler(BaseHTTPRequestHandler):
+        def send_json(self, code, data):
+            body = json.dumps(data, indent=2).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/status":
+                self.send_json(200, server.status())
+            else:
+                self.send_json(404, {"error": "unknown path {}".format(self.path)})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/build":
+                self.send_json(404, {"error": "unknown path {}".format(self.path)})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                document = json.loads(self.rfile.read(length).decode() or "{}")
+                if not isinstance(document, dict):
+                    raise ValueError("the config document must be a json object")
+                config = server.config(document)
+            except (ValueError, TypeError) as err:
+                self.send_json(400, {"status": "failed", "error": str(err)})
+                return
+            result = server.build(config)
+            self.send_json(200 if result["status"] == "ok" else 500, result)
+
+    return BuildHandler
+
+
+def warm_up(engines):
+    # the imports a cold build pays for
+    import dactyl_manuform
+    for engine in engines:
+        print("LOADING {} ENGINE".format(engine))
+        importlib.import_module("helpers_" + engine)
+
+
+def usage():
+    print("usage: python src/build_server.py [--host=127.0.0.1] [--port=8765] [--engines=cadquery] [--isolate]"
+          " [--timeout=seconds]")
+    sys.exit(-1)
+
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "", ["host=", "port=", "engines=", "isolate", "timeout="])
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+
+    host = "127.0.0.1"
+    port = 8765
+    engines = ["cadquery"]
+    isolate = False
+    timeout = None
+    for opt, arg in opts:
+        if opt == '--host':
+            host = arg
+        elif opt == '--port':
+            port = int(arg)
+        elif opt == '--engines':
+            engines = [item for item in arg.split(",") if item]
+        elif opt == '--isolate':
+            isolate = True
+        elif opt == '--timeout':
+            timeout = float(arg)
+
+    if isolate and not fork_available():
+        print("--isolate NEEDS FORK, BUILDING IN THE SERVER PROCESS")
+        isolate = False
+
+    with open(run_config, mode='r') as fid:
+        base_config = json.load(fid)
+    warm_up(engines)
+
+    httpd = ThreadingHTTPServer((host, port), make_handler(BuildServer(base_config, isolate, timeout)))
+    print("BUILD SERVER LISTENING ON http://{}:{}".format(host, port))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    httpd.server_close()
@@ -0,0 +1,146 @@
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows, peak RSS is left out
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return round(peak / 2. ** 20, 1)  # bytes on macOS, kilobytes everywhere else
+    return round(peak / 2. ** 10, 1)
+
+
+# Records wall time, CPU time, peak RSS and the size of the resulting shape of each named build stage.
+# Stages nest, so a stage's time includes the stages run inside it.  With profiling on, every stage gets its
+# own cProfile dump holding only the calls made outside of its nested stages.
+class BuildTrace(object):
+    def __init__(self, enabled=False, profile=False, count_shape=None):
+        self.enabled = enabled
+        self.profile = profile
+        self.count_shape = count_shape
+        self.start_time = time.perf_counter()
+        self.records = []
+        self.profiles = {}
+        self.profilers = []
+        self.depth = 0
+
+    def profiled(self, name):
+        # profile is True for every stage or a list of stage name prefixes
+        if self.profile is True:
+            return True
+        return bool(self.profile) and any(name.startswith(prefix) for prefix in self.profile)
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield {}
+            return
+
+        record = {"name": name, "pid": os.getpid(), "depth": self.depth}
+        profiler = None
+        if self.profiled(name):
+            # only one profiler can be active, the enclosing stage's pauses until this one is done
+            if self.profilers:
+                self.profilers[-1].disable()
+            profiler = cProfile.Profile()
+            self.profilers.append(profiler)
+            profiler.enable()
+
+        self.depth += 1
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - start_wall, 4)
+            record["cpu_s"] = round(time.process_time() - start_cpu, 4)
+            self.depth -= 1
+            if profiler is not None:
+                profiler.disable()
+                self.profilers.pop()
+                self.profiles[name] = profiler
+                if self.profilers:
+                    self.profilers[-1].enable()
+
+            record["start_s"] = round(start_wall - self.start_time, 4)
+            record["peak_rss_mb"] = peak_rss_mb()
+            shape = record.pop("shape", None)
+            if shape is not None and self.count_shape is not None:
+                try:
+                    record.update(self.count_shape(shape))
+                except Exception as err:
+                    record["count_error"] = str(err)
+            self.records.append(record)
+            print("STAGE {} {:.2f}s".format(name, record["wall_s"]))
+
+    def run(self, name, builder):
+        with self.stage(name) as record:
+            result = builder()
+            record["shape"] = result
+        return result
+
+    def chrome_events(self):
+        # "complete" events, load the file in chrome://tracing or https://ui.perfetto.dev
+        events = []
+        for record in self.records:
+            args = {key: value for key, value in record.items() if key not in ["name", "pid", "start_s", "wall_s"]}
+            events.append({
+                "name": record["name"],
+                "ph": "X",
+                "pid": record["pid"],
+                "tid": record["pid"],
+                "ts": int(record["start_s"] * 1e6),
+                "dur": int(record["wall_s"] * 1e6),
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_part(self, fname, dir_name, prefix):
+        # forked workers hand their records back to the parent through a file, and dump their own profiles
+        with open(fname, mode='w') as fid:
+            json.dump(self.records, fid)
+        self.dump_profiles(dir_name, prefix)
+
+    def load_part(self, fname):
+        if not os.path.exists(fname):
+            return
+        with open(fname, mode='r') as fid:
+            self.records += json.load(fid)
+        os.remove(fname)
+
+    def reset(self):
+        # a forked worker starts with a copy of its parent's records, the parent keeps those
+        self.records = []
+        self.profiles = {}
+
+    def dump_profiles(self, dir_name, prefix):
+        for name, profiler in self.profiles.items():
+            profile_dir = os.path.join(dir_name, "profiles")
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(profile_dir, prefix + "_" + name.replace(" ", "_") + ".prof"))
+
+    def write(self, dir_name, prefix):
+        if not self.enabled:
+            return
+        os.makedirs(dir_name, exist_ok=True)
+        trace_file = os.path.join(dir_name, prefix + "_trace.json")
+        with open(trace_file, mode='w') as fid:
+            json.dump({
+                "seconds": round(time.perf_counter() - self.start_time, 4),
+                "peak_rss_mb": peak_rss_mb(),
+                "stages": sorted(self.records, key=lambda record: record["start_s"]),
+            }, fid, indent=2)
+        with open(os.path.join(dir_name, prefix + "_trace.chrome.json"), mode='w') as fid:
+            json.dump(self.chrome_events(), fid)
+        self.dump_profiles(dir_name, prefix)
+        print("TRACE WRITTEN TO {}".format(trace_file))
@@ -1,7 +1,8 @@
 import os
 import json
 import sys
-import dactyl_manuform
+import getopt
+from build_pool import BuildJob, run_jobs
 
 json_template = """
 {
@@ -34,16 +35,6 @@ variations = [
     [6, 8]
 ]
 
-gen_dir = sys.argv[1]
-
-try:
-    print(gen_dir)
-except NameError:
-    print("Must provide target directory for generating bulk models")
-    sys.exit(-1)
-
-out_file = os.path.join(gen_dir, "bulk_config")
-
 engine = "cadquery"
 default = "DEFAULT"
 trackball = "TRACKBALL_WILD"
@@ -52,40 +43,19 @@ normal = "NOTCH"
 run_config = os.path.join(r"src", 'run_config.json')
 
 
-def write_file(file_path, data):
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    f = open(file_path, "a")
-    f.write(json.dumps(data, indent=2))
-    f.close()
-
-
-def set_overrides(override):
-    with open(run_config, mode='r') as fid:
-        data = json.load(fid)
-    previous_overrides = data["overrides"]
-    data["overrides"] = override
-    write_file(run_config, data)
-    return previous_overrides
-
-
-previous_overrides = set_overrides(out_file)
-
-
-def finished():
-    set_overrides(previous_overrides)
-    sys.exit(0)
+def usage():
+    print("usage: python src/bulk_build.py <target directory> [--jobs=<number of parallel builds>]")
+    sys.exit(-1)
 
 
-def write_config(rows, cols, engine, thumb1, plate, last_rows):
-    config = json.loads(json_template)
+def make_config(base, gen_dir, rows, cols, engine, thumb1, plate, last_rows):
+    config = dict(base)
+    config.update(json.loads(json_template))
     name = str(rows) + "_x_" + str(cols) + "_" + plate  + "_" + last_rows  + "_" + thumb1
     config["save_dir"] = os.path.join(gen_dir, str(rows) + "_x_" + str(cols), plate, last_rows)
-    print("Generating: ", name)
-    config["overrides"] = out_file
     config["save_name"] = name
     config["override_name"] = thumb1
-    config["engine"] = engine
+    config["ENGINE"] = engine
     config["nrows"] = rows
     config["ncols"] = cols
     config["plate_style"] = "NUB" if plate == "normal" else "HS_NUB"
@@ -94,19 +64,40 @@ def write_config(rows, cols, engine, thumb1, plate, last_rows):
     config["full_last_rows"] = True if last_rows == "full" else False
     config["ball_side"] = "both"
 
-    write_file(out_file + '.json', config)
+    return name, config
 
 
-for v in variations:
-    rows = v[0]
-    cols = v[1]
-    for last_row in ["normal", "full"]:
-        for plate in ["normal", "hotswap"]:
-            for thumb1 in [default, trackball]:
-                write_config(rows, cols, "cadquery", thumb1, plate, last_row)
-                dactyl_manuform.make_dactyl()
-
-
-finished()
+def bulk_jobs(gen_dir):
+    # every variation gets its own config in memory, nothing is written back to run_config.json
+    with open(run_config, mode='r') as fid:
+        base = json.load(fid)
+
+    jobs = []
+    for v in variations:
+        rows = v[0]
+        cols = v[1]
+        for last_row in ["normal", "full"]:
+            for plate in ["normal", "hotswap"]:
+                for thumb1 in [default, trackball]:
+                    name, config = make_config(base, gen_dir, rows, cols, engine, thumb1, plate, last_row)
+                    jobs.append(BuildJob(name, config, log_file=os.path.join(gen_dir, "logs", name + ".log")))
+    return jobs
+
+
+if __name__ == '__main__':
+    opts, args = getopt.getopt(sys.argv[1:], "", ["jobs="])
+    if len(args) < 1:
+        print("Must provide target directory for generating bulk models")
+        usage()
+    gen_dir = args[0]
+    print(gen_dir)
 
+    workers = None
+    for opt, arg in opts:
+        if opt in '--jobs':
+            workers = int(arg)
 
+    os.makedirs(gen_dir, exist_ok=True)
+    manifest = run_jobs(bulk_jobs(gen_dir), workers=workers, manifest_file=os.path.join(gen_dir, "bulk_manifest.json"))
+    print("BULK BUILD DONE: {} ok, {} failed".format(manifest["ok"], manifest["failed"]))
+    sys.exit(0 if manifest["failed"] == 0 else 1)
@@ -0,0 +1,65 @@
+import importlib
+
+# thumb_style name -> "module:Class" of its cluster.  A cluster module is imported the first time its style is
+# built, so a DEFAULT board never loads the trackball clusters.
+cluster_classes = {
+    "DEFAULT": "clusters.default_cluster:DefaultCluster",
+    "CARBONFET": "clusters.carbonfet:CarbonfetCluster",
+    "MINI": "clusters.mini:MiniCluster",
+    "MINIDOX": "clusters.minidox:MinidoxCluster",
+    "TRACKBALL_ORBYL": "clusters.trackball_orbyl:TrackballOrbyl",
+    "TRACKBALL_WILD": "clusters.trackball_wilder:TrackballWild",
+    "TRACKBALL_BTU": "clusters.trackball_btu:TrackballBTU",
+    "TRACKBALL_CJ": "clusters.trackball_cj:TrackballCJ",
+    "CUSTOM": "clusters.custom_cluster:CustomCluster",
+}
+
+# installed packages add clusters with an entry point in this group, named after the thumb_style:
+#   [project.entry-points."dactyl_keyboard.clusters"]
+#   MY_THUMB = "my_package.my_cluster:MyCluster"
+entry_point_group = "dactyl_keyboard.clusters"
+
+loaded_classes = {}
+entry_points_read = False
+
+
+def register_cluster(style, target):
+    # target is a cluster class or its "module:Class" path
+    if isinstance(target, str):
+        cluster_classes[style] = target
+        loaded_classes.pop(style, None)
+    else:
+        cluster_classes[style] = "{}:{}".format(target.__module__, target.__name__)
+        loaded_classes[style] = target
+
+
+def read_entry_points():
+    global entry_points_read
+    if entry_points_read:
+        return
+    entry_points_read = True
+    from importlib.metadata import entry_points
+    try:
+        points = entry_points(group=entry_point_group)
+    except TypeError:
+        points = entry_points().get(entry_point_group, [])  # python < 3.10
+    for point in points:
+        # the built in clusters keep their names
+        cluster_classes.setdefault(point.name, point.value)
+
+
+def cluster_styles():
+    read_entry_points()
+    return sorted(cluster_classes)
+
+
+def cluster_class(style):
+    if style not in cluster_classes:
+        read_entry_points()
+    if style not in cluster_classes:
+        print("UNKNOWN THUMB STYLE {}, USING DEFAULT".format(style))
+        style = "DEFAULT"
+    if style not in loaded_classes:
+        module_name, class_name = cluster_classes[style].split(":")
+        loaded_classes[style] = getattr(importlib.import_module(module_name), class_name)
+    return loaded_classes[style]
@@ -1,36 +1,16 @@
-from clusters.default_cluster import DefaultCluster
-import json
-import os
+from clusters.default_cluster import DefaultCluster, build_names
 
 class CarbonfetCluster(DefaultCluster):
+    config_file = "CARBONFET.json"
 
     @staticmethod
     def name():
         return "CARBONFET"
 
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "CARBONFET.json"), mode='r') as fid:
-            data = json.load(fid)
-
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
-        super().__init__(parent_locals)
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+    def __init__(self, config, parent_locals):
+        super().__init__(config, parent_locals)
+        globals().update(build_names(config, parent_locals))
 
     def tl_place(self, shape):
         shape = rotate(shape, [10, -24, 10])
@@ -75,18 +55,18 @@ class CarbonfetCluster(DefaultCluster):
     def thumb_1x_layout(self, shape, cap=False):
         debugprint('thumb_1x_layout()')
         return union([
-            self.tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-            self.mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-            self.br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
-            self.tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
+            self.tr_place(rotate(shape, [0, 0, self.config.thumb_plate_tr_rotation])),
+            self.mr_place(rotate(shape, [0, 0, self.config.thumb_plate_mr_rotation])),
+            self.br_place(rotate(shape, [0, 0, self.config.thumb_plate_br_rotation])),
+            self.tl_place(rotate(shape, [0, 0, self.config.thumb_plate_tl_rotation])),
         ])
 
     def thumb_15x_layout(self, shape, cap=False, plate=True):
         debugprint('thumb_15x_layout()')
         if plate:
             return union([
-                self.bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
-                self.ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation]))
+                self.bl_place(rotate(shape, [0, 0, self.config.thumb_plate_bl_rotation])),
+                self.ml_place(rotate(shape, [0, 0, self.config.thumb_plate_ml_rotation]))
             ])
         else:
             return union([
@@ -215,20 +195,20 @@ class CarbonfetCluster(DefaultCluster):
             triangle_hulls(
                 [
                     self.ml_place(self.thumb_post_tl()),
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.ml_place(self.thumb_post_tr()),
-                    key_place(web_post_br(), 0, cornerrow),
+                    key_place(web_post_br(), 0, self.config.cornerrow),
                     self.tl_place(web_post_tl()),
-                    key_place(web_post_bl(), 1, cornerrow),
+                    key_place(web_post_bl(), 1, self.config.cornerrow),
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tl_wall(web_post_br()),
-                    key_place(web_post_br(), 2, lastrow),
-                    key_place(web_post_bl(), 3, lastrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
                     self.tl_wall(web_post_br()),
                     self.tr_place(web_post_tr()),
                 ]
@@ -238,10 +218,10 @@ class CarbonfetCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -249,10 +229,10 @@ class CarbonfetCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, lastrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, lastrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
                 ]
             )
         )
@@ -262,7 +242,7 @@ class CarbonfetCluster(DefaultCluster):
                 [
                     self.tr_place(web_post_br()),
                     self.tr_place(web_post_tr()),
-                    key_place(web_post_bl(), 3, lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
                 ]
             )
         )
@@ -270,13 +250,13 @@ class CarbonfetCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -284,9 +264,9 @@ class CarbonfetCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, lastrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -294,9 +274,9 @@ class CarbonfetCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -322,7 +302,7 @@ class CarbonfetCluster(DefaultCluster):
         shape = union([shape, wall_brace(self.mr_place, 0, -1.15, web_post_bl(), self.br_place, 0, -1, web_post_br())])
         shape = union([shape, wall_brace(self.bl_place, -1, 0, web_post_bl(), self.br_place, -1, 0, web_post_tl())])
         shape = union([shape,
-                       wall_brace(self.tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1,
+                       wall_brace(self.tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1,
                                   web_post_bl())])
         return shape
 
@@ -332,8 +312,8 @@ class CarbonfetCluster(DefaultCluster):
         # clunky bit on the top left thumb connection  (normal connectors don't work well)
         shape = bottom_hull(
             [
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.bl_place(translate(self.thumb_post_tr(), wall_locate2(-0.3, 1))),
                 self.bl_place(translate(self.thumb_post_tr(), wall_locate3(-0.3, 1))),
             ]
@@ -342,9 +322,9 @@ class CarbonfetCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
                                self.bl_place(translate(self.thumb_post_tr(), wall_locate2(-0.3, 1))),
                                self.bl_place(translate(self.thumb_post_tr(), wall_locate3(-0.3, 1))),
@@ -355,12 +335,12 @@ class CarbonfetCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1,
+                               left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
                                self.ml_place(self.thumb_post_tl()),
                            ]
@@ -369,10 +349,10 @@ class CarbonfetCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1,
+                               left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
-                               key_place(web_post_bl(), 0, cornerrow),
+                               key_place(web_post_bl(), 0, self.config.cornerrow),
                                self.ml_place(self.thumb_post_tl()),
                            ]
                        )])
@@ -1,37 +1,17 @@
-from clusters.default_cluster import DefaultCluster
-import json
-import os
+from clusters.default_cluster import DefaultCluster, build_names
 
 class CustomCluster(DefaultCluster):
+    config_file = "CUSTOM.json"
 
     @staticmethod
     def name():
         return "CUSTOM"
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "CUSTOM.json"), mode='r') as fid:
-            data = json.load(fid)
-
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
+    def __init__(self, config, parent_locals):
         self.num_keys = 7
-        super().__init__(parent_locals)
+        super().__init__(config, parent_locals)
         # have to repeat this for all classes/namespaces
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+        globals().update(build_names(config, parent_locals))
 
     def tl_place(self, shape):
         debugprint('tl_place()')
@@ -108,7 +88,7 @@ class CustomCluster(DefaultCluster):
 
     def thumbcaps(self, side='right'):
         t1 = self.thumb_1x_layout(sa_cap(1), cap=True)
-        if not default_1U_cluster:
+        if not self.config.default_1U_cluster:
             t1.add(self.thumb_15x_layout(sa_cap(1), cap=True))
         return t1
 
@@ -121,23 +101,23 @@ class CustomCluster(DefaultCluster):
     def thumb_post_tr(self):
         debugprint('thumb_post_tr()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, ((mount_height / 2)) - post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, ((self.config.mount_height / 2)) - self.config.post_adj, 0]
                          )
 
     def thumb_post_tl(self):
         debugprint('thumb_post_tl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, ((mount_height / 2)) - post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, ((self.config.mount_height / 2)) - self.config.post_adj, 0]
                          )
 
     def thumb_post_bl(self):
         debugprint('thumb_post_bl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, -((mount_height / 2)) + post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, -((self.config.mount_height / 2)) + self.config.post_adj, 0]
                          )
 
     def thumb_post_br(self):
         debugprint('thumb_post_br()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, -((mount_height / 2)) + post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, -((self.config.mount_height / 2)) + self.config.post_adj, 0]
                          )
@@ -1,8 +1,34 @@
+import copy
 import json
 import os
+from types import MappingProxyType
+from transforms import MatrixProbe
+
+config_dir = os.path.join("src", "clusters", "json")
+
+# parsed settings files, shared by every cluster built in this process and keyed by file path and modification time
+config_files = {}
+# (cluster, key) pairs already reported as unknown
+unknown_keys = set()
+
+
+def read_config_file(file_name):
+    full_name = os.path.join(config_dir, file_name)
+    key = (os.path.abspath(full_name), os.path.getmtime(full_name))
+    if key not in config_files:
+        with open(full_name, mode='r') as fid:
+            config_files[key] = MappingProxyType(json.load(fid))
+    return config_files[key]
+
+
+def build_names(config, parent_locals):
+    # the build's functions and engine helpers, the settings and the values derived from them are read from
+    # self.config
+    return {name: value for name, value in parent_locals.items() if not config.provides(name)}
 
 
 class DefaultCluster(object):
+    config_file = "DEFAULT.json"
     num_keys = 6
     is_tb = False
     thumb_offsets = [
@@ -23,24 +49,76 @@ class DefaultCluster(object):
 
 
     def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "DEFAULT.json"), mode='r') as fid:
-            data = json.load(fid)
+        # settings files of this class and its bases, the most derived class wins
+        data = {}
+        for cls in reversed(type(self).__mro__):
+            if "config_file" in cls.__dict__:
+                data.update(read_config_file(cls.config_file))
         for item in data:
             if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
+                unknown = (self.name(), str(item))
+                if unknown not in unknown_keys:
+                    unknown_keys.add(unknown)
+                    print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
                 continue
-            setattr(self, str(item), data[item])
+            # every cluster gets its own copy, the parsed files are shared
+            setattr(self, str(item), copy.deepcopy(data[item]))
         return data
 
-    def __init__(self, parent_locals):
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+    def __init__(self, config, parent_locals):
+        self.config = config
+        globals().update(build_names(config, parent_locals))
         self.get_config()
+        if self.config.ENGINE == 'cadquery' and self.config.lazy_transforms:
+            self.cache_placements()
         print(self.name(), " built")
 
+    def __setattr__(self, name, value):
+        # the cached origin and placements depend on the cluster settings, drop them whenever one changes
+        if not name.startswith('_'):
+            self.__dict__['_placements'] = {}
+        object.__setattr__(self, name, value)
+
+    def placements(self):
+        if '_placements' not in self.__dict__:
+            self._placements = {}
+        return self._placements
+
+    def cached(self, name, calc):
+        placements = self.placements()
+        if name not in placements:
+            placements[name] = calc()
+        return copy.deepcopy(placements[name])
+
+    def cache_placements(self):
+        # every <slot>_place method is a fixed rotate / translate chain, compose each one into a single matrix
+        # and place shapes with that.  methods are replaced on the instance, the class keeps the originals.
+        for name in dir(type(self)):
+            if name.endswith('_place') and callable(getattr(type(self), name)):
+                method = getattr(type(self), name)
+                self.__dict__[name] = self.cached_placement(name, method)
+
+    def cached_placement(self, name, method):
+        def place(shape):
+            if isinstance(shape, MatrixProbe):
+                return method(self, shape)
+            return transform(shape, self.slot_matrix(name))
+        return place
+
+    def slot_matrix(self, name):
+        placements = self.placements()
+        if name not in placements:
+            matrix = getattr(type(self), name)(self, MatrixProbe()).matrix
+            matrix.flags.writeable = False
+            placements[name] = matrix
+        return placements[name]
+
     def thumborigin(self):
+        return self.cached('thumborigin', self.calc_thumborigin)
+
+    def calc_thumborigin(self):
         # debugprint('thumborigin()')
-        origin = key_position([mount_width / 2, -(mount_height / 2), 0], 1, cornerrow)
+        origin = key_position([self.config.mount_width / 2, -(self.config.mount_height / 2), 0], 1, self.config.cornerrow)
 
         for i in range(len(origin)):
             origin[i] = origin[i] + self.thumb_offsets[i]
@@ -99,7 +177,7 @@ class DefaultCluster(object):
                 self.bl_place(rotate(shape, [0, 0, self.thumb_plate_bl_rotation])),
             ]
 
-            if default_1U_cluster:
+            if self.config.default_1U_cluster:
                 shape_list.append(self.tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, self.thumb_plate_tr_rotation])))
                 shape_list.append(self.tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, self.thumb_plate_tr_rotation])))
                 shape_list.append(self.tl_place(rotate(shape, [0, 0, self.thumb_plate_tl_rotation])))
@@ -112,7 +190,7 @@ class DefaultCluster(object):
                 self.br_place(rotate(shape, [0, 0, self.thumb_plate_br_rotation])),
                 self.bl_place(rotate(shape, [0, 0, self.thumb_plate_bl_rotation])),
             ]
-            if default_1U_cluster:
+            if self.config.default_1U_cluster:
                 shape_list.append(self.tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, self.thumb_plate_tr_rotation])))
             shapes = union(shape_list)
         return shapes
@@ -127,7 +205,7 @@ class DefaultCluster(object):
                 return add(cap_list)
             else:
                 shape_list = [self.tl_place(rotate(shape, [0, 0, self.thumb_plate_tl_rotation]))]
-                if not default_1U_cluster:
+                if not self.config.default_1U_cluster:
                     shape_list.append(self.tr_place(rotate(shape, [0, 0, self.thumb_plate_tr_rotation])))
                 return union(shape_list)
         else:
@@ -143,14 +221,14 @@ class DefaultCluster(object):
                 shape_list = [
                     self.tl_place(shape),
                 ]
-                if not default_1U_cluster:
+                if not self.config.default_1U_cluster:
                     shape_list.append(self.tr_place(shape))
 
                 return union(shape_list)
 
     def thumbcaps(self, side='right'):
         t1 = self.thumb_1x_layout(sa_cap(1), cap=True)
-        if not default_1U_cluster:
+        if not self.config.default_1U_cluster:
             t1.add(self.thumb_15x_layout(sa_cap(1.5), cap=True))
         return t1
 
@@ -165,25 +243,25 @@ class DefaultCluster(object):
     def thumb_post_tr(self):
         debugprint('thumb_post_tr()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, ((mount_height / 2) + double_plate_height) - post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, ((self.config.mount_height / 2) + self.config.double_plate_height) - self.config.post_adj, 0]
                          )
 
     def thumb_post_tl(self):
         debugprint('thumb_post_tl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, ((mount_height / 2) + double_plate_height) - post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, ((self.config.mount_height / 2) + self.config.double_plate_height) - self.config.post_adj, 0]
                          )
 
     def thumb_post_bl(self):
         debugprint('thumb_post_bl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, -((mount_height / 2) + double_plate_height) + post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, -((self.config.mount_height / 2) + self.config.double_plate_height) + self.config.post_adj, 0]
                          )
 
     def thumb_post_br(self):
         debugprint('thumb_post_br()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, -((mount_height / 2) + double_plate_height) + post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, -((self.config.mount_height / 2) + self.config.double_plate_height) + self.config.post_adj, 0]
                          )
 
     def thumb_connectors(self, side="right"):
@@ -191,7 +269,7 @@ class DefaultCluster(object):
         hulls = []
 
         # Top two
-        if default_1U_cluster:
+        if self.config.default_1U_cluster:
             hulls.append(
                 triangle_hulls(
                     [
@@ -265,7 +343,7 @@ class DefaultCluster(object):
             )
         )
 
-        if default_1U_cluster:
+        if self.config.default_1U_cluster:
             hulls.append(
                 triangle_hulls(
                     [
@@ -299,31 +377,31 @@ class DefaultCluster(object):
                 )
             )
 
-        if default_1U_cluster:
+        if self.config.default_1U_cluster:
             hulls.append(
                 triangle_hulls(
                     [
                         self.tl_place(self.thumb_post_tl()),
-                        key_place(web_post_bl(), 0, cornerrow),
+                        key_place(web_post_bl(), 0, self.config.cornerrow),
                         self.tl_place(self.thumb_post_tr()),
-                        key_place(web_post_bl(), 1, cornerrow),
+                        key_place(web_post_bl(), 1, self.config.cornerrow),
                         self.tr_place(web_post_tl()),
-                        key_place(web_post_bl(), 1, cornerrow),
+                        key_place(web_post_bl(), 1, self.config.cornerrow),
                         self.tr_place(web_post_tr()),
-                        key_place(web_post_br(), 1, cornerrow),
-                        key_place(web_post_tl(), 2, lastrow),
-                        key_place(web_post_bl(), 2, lastrow),
+                        key_place(web_post_br(), 1, self.config.cornerrow),
+                        key_place(web_post_tl(), 2, self.config.lastrow),
+                        key_place(web_post_bl(), 2, self.config.lastrow),
                         self.tr_place(web_post_tr()),
-                        key_place(web_post_bl(), 2, lastrow),
+                        key_place(web_post_bl(), 2, self.config.lastrow),
                         self.tr_place(web_post_br()),
-                        key_place(web_post_br(), 2, lastrow),
-                        key_place(web_post_bl(), 3, lastrow),
-                        key_place(web_post_tr(), 2, lastrow),
-                        key_place(web_post_tl(), 3, lastrow),
-                        key_place(web_post_bl(), 3, cornerrow),
-                        key_place(web_post_tr(), 3, lastrow),
-                        key_place(web_post_br(), 3, cornerrow),
-                        key_place(web_post_bl(), 4, cornerrow),
+                        key_place(web_post_br(), 2, self.config.lastrow),
+                        key_place(web_post_bl(), 3, self.config.lastrow),
+                        key_place(web_post_tr(), 2, self.config.lastrow),
+                        key_place(web_post_tl(), 3, self.config.lastrow),
+                        key_place(web_post_bl(), 3, self.config.cornerrow),
+                        key_place(web_post_tr(), 3, self.config.lastrow),
+                        key_place(web_post_br(), 3, self.config.cornerrow),
+                        key_place(web_post_bl(), 4, self.config.cornerrow),
                     ]
                 )
             )
@@ -332,26 +410,26 @@ class DefaultCluster(object):
                 triangle_hulls(
                     [
                         self.tl_place(self.thumb_post_tl()),
-                        key_place(web_post_bl(), 0, cornerrow),
+                        key_place(web_post_bl(), 0, self.config.cornerrow),
                         self.tl_place(self.thumb_post_tr()),
-                        key_place(web_post_br(), 0, cornerrow),
+                        key_place(web_post_br(), 0, self.config.cornerrow),
                         self.tr_place(self.thumb_post_tl()),
-                        key_place(web_post_bl(), 1, cornerrow),
+                        key_place(web_post_bl(), 1, self.config.cornerrow),
                         self.tr_place(self.thumb_post_tr()),
-                        key_place(web_post_br(), 1, cornerrow),
-                        key_place(web_post_tl(), 2, lastrow),
-                        key_place(web_post_bl(), 2, lastrow),
+                        key_place(web_post_br(), 1, self.config.cornerrow),
+                        key_place(web_post_tl(), 2, self.config.lastrow),
+                        key_place(web_post_bl(), 2, self.config.lastrow),
                         self.tr_place(self.thumb_post_tr()),
-                        key_place(web_post_bl(), 2, lastrow),
+                        key_place(web_post_bl(), 2, self.config.lastrow),
                         self.tr_place(self.thumb_post_br()),
-                        key_place(web_post_br(), 2, lastrow),
-                        key_place(web_post_bl(), 3, lastrow),
-                        key_place(web_post_tr(), 2, lastrow),
-                        key_place(web_post_tl(), 3, lastrow),
-                        key_place(web_post_bl(), 3, cornerrow),
-                        key_place(web_post_tr(), 3, lastrow),
-                        key_place(web_post_br(), 3, cornerrow),
-                        key_place(web_post_bl(), 4, cornerrow),
+                        key_place(web_post_br(), 2, self.config.lastrow),
+                        key_place(web_post_bl(), 3, self.config.lastrow),
+                        key_place(web_post_tr(), 2, self.config.lastrow),
+                        key_place(web_post_tl(), 3, self.config.lastrow),
+                        key_place(web_post_bl(), 3, self.config.cornerrow),
+                        key_place(web_post_tr(), 3, self.config.lastrow),
+                        key_place(web_post_br(), 3, self.config.cornerrow),
+                        key_place(web_post_bl(), 4, self.config.cornerrow),
                     ]
                 )
             )
@@ -359,24 +437,24 @@ class DefaultCluster(object):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
 
-        if not full_last_rows:
+        if not self.config.full_last_rows:
             hulls.append(
                 triangle_hulls(
                     [
-                        key_place(web_post_tr(), 3, lastrow),
-                        key_place(web_post_br(), 3, lastrow),
-                        key_place(web_post_tr(), 3, lastrow),
-                        key_place(web_post_bl(), 4, cornerrow),
+                        key_place(web_post_tr(), 3, self.config.lastrow),
+                        key_place(web_post_br(), 3, self.config.lastrow),
+                        key_place(web_post_tr(), 3, self.config.lastrow),
+                        key_place(web_post_bl(), 4, self.config.cornerrow),
                     ]
                 )
             )
@@ -386,7 +464,7 @@ class DefaultCluster(object):
     def walls(self, side="right"):
         print('thumb_walls()')
         # thumb, walls
-        if default_1U_cluster:
+        if self.config.default_1U_cluster:
             shape = union([wall_brace(self.mr_place, 0, -1, web_post_br(), self.tr_place, 0, -1, web_post_br())])
         else:
             shape = union([wall_brace(self.mr_place, 0, -1, web_post_br(), self.tr_place, 0, -1, self.thumb_post_br())])
@@ -403,13 +481,13 @@ class DefaultCluster(object):
         shape = union([shape, wall_brace(self.mr_place, 0, -1, web_post_bl(), self.br_place, 0, -1, web_post_br())])
         shape = union([shape, wall_brace(self.ml_place, 0, 1, web_post_tl(), self.bl_place, 0, 1, web_post_tr())])
         shape = union([shape, wall_brace(self.bl_place, -1, 0, web_post_bl(), self.br_place, -1, 0, web_post_tl())])
-        if default_1U_cluster:
+        if self.config.default_1U_cluster:
             shape = union([shape,
-                           wall_brace(self.tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0,
+                           wall_brace(self.tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, self.config.lastrow)), 0,
                                       -1, web_post_bl())])
         else:
             shape = union([shape, wall_brace(self.tr_place, 0, -1, self.thumb_post_br(),
-                                             (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+                                             (lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1, web_post_bl())])
 
         return shape
 
@@ -418,8 +496,8 @@ class DefaultCluster(object):
         # clunky bit on the top left thumb connection  (normal connectors don't work well)
         shape = union([bottom_hull(
             [
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
                 self.ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             ]
@@ -428,9 +506,9 @@ class DefaultCluster(object):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1,
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1,
                                               low_corner=True, side=side),
                                self.ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
                                self.ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
@@ -441,18 +519,18 @@ class DefaultCluster(object):
 
         shape = union([shape, hull_from_shapes(
             [
-                left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.tl_place(self.thumb_post_tl()),
             ]
         )])
 
         shape = union([shape, hull_from_shapes(
             [
-                left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                key_place(web_post_bl(), 0, cornerrow),
+                left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                key_place(web_post_bl(), 0, self.config.cornerrow),
                 self.tl_place(self.thumb_post_tl()),
             ]
         )])
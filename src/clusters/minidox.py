@@ -1,44 +1,24 @@
-from clusters.default_cluster import DefaultCluster
-import os
-import json
+from clusters.default_cluster import DefaultCluster, build_names
 
 
 class MinidoxCluster(DefaultCluster):
+    config_file = "MINIDOX.json"
     minidox_Usize = 1.6
 
     @staticmethod
     def name():
         return "MINIDOX"
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "MINIDOX.json"), mode='r') as fid:
-            data = json.load(fid)
-
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
+    def __init__(self, config, parent_locals):
         self.num_keys = 3
-        super().__init__(parent_locals)
+        super().__init__(config, parent_locals)
         # have to repeat this for all classes/namespaces
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+        globals().update(build_names(config, parent_locals))
 
-    def thumborigin(self):
+    def calc_thumborigin(self):
         # debugprint('thumborigin()')
-        origin = super().thumborigin()
-        origin[1] = origin[1] - .4 * (trackball_Usize - 1) * sa_length
+        origin = super().calc_thumborigin()
+        origin[1] = origin[1] - .4 * (self.config.trackball_Usize - 1) * self.config.sa_length
         return origin
 
     def tl_place(self, shape):
@@ -126,25 +106,25 @@ class MinidoxCluster(DefaultCluster):
     def thumb_post_tr(self):
         debugprint('thumb_post_tr()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, ((mount_height/2) + adjustable_plate_size(self.minidox_Usize)) - post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, ((self.config.mount_height/2) + adjustable_plate_size(self.minidox_Usize)) - self.config.post_adj, 0]
                          )
 
     def thumb_post_tl(self):
         debugprint('thumb_post_tl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, ((mount_height/2) + adjustable_plate_size(self.minidox_Usize)) - post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, ((self.config.mount_height/2) + adjustable_plate_size(self.minidox_Usize)) - self.config.post_adj, 0]
                          )
 
     def thumb_post_bl(self):
         debugprint('thumb_post_bl()')
         return translate(web_post(),
-                         [-(mount_width / 2) + post_adj, -((mount_height/2) + adjustable_plate_size(self.minidox_Usize)) + post_adj, 0]
+                         [-(self.config.mount_width / 2) + self.config.post_adj, -((self.config.mount_height/2) + adjustable_plate_size(self.minidox_Usize)) + self.config.post_adj, 0]
                          )
 
     def thumb_post_br(self):
         debugprint('thumb_post_br()')
         return translate(web_post(),
-                         [(mount_width / 2) - post_adj, -((mount_height/2) + adjustable_plate_size(self.minidox_Usize)) + post_adj, 0]
+                         [(self.config.mount_width / 2) - self.config.post_adj, -((self.config.mount_height/2) + adjustable_plate_size(self.minidox_Usize)) + self.config.post_adj, 0]
                          )
 
     def thumb_connectors(self, side="right"):
@@ -181,34 +161,34 @@ class MinidoxCluster(DefaultCluster):
             triangle_hulls(
                 [
                     self.tl_place(self.thumb_post_tl()),
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.tl_place(self.thumb_post_tr()),
-                    key_place(web_post_br(), 0, cornerrow),
+                    key_place(web_post_br(), 0, self.config.cornerrow),
                     self.tr_place(self.thumb_post_tl()),
-                    key_place(web_post_bl(), 1, cornerrow),
+                    key_place(web_post_bl(), 1, self.config.cornerrow),
                     self.tr_place(self.thumb_post_tr()),
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tr_place(self.thumb_post_tr()),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tr_place(self.thumb_post_br()),
-                    key_place(web_post_br(), 2, lastrow),
-                    key_place(web_post_bl(), 3, lastrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
                 ]
             )
         )
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, lastrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -216,21 +196,21 @@ class MinidoxCluster(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -251,7 +231,7 @@ class MinidoxCluster(DefaultCluster):
         shape = union([shape, wall_brace(self.ml_place, -1, 0, self.thumb_post_tl(), self.ml_place, 0, 1, self.thumb_post_tl())])
         # thumb, tweeners
         shape = union([shape, wall_brace(self.ml_place, 0, 1, self.thumb_post_tr(), self.ml_place, 0, 1, self.thumb_post_tl())])
-        shape = union([shape, wall_brace(self.tr_place, 0, -1, self.thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+        shape = union([shape, wall_brace(self.tr_place, 0, -1, self.thumb_post_br(), (lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1, web_post_bl())])
 
         return shape
 
@@ -261,8 +241,8 @@ class MinidoxCluster(DefaultCluster):
         # clunky bit on the top left thumb connection  (normal connectors don't work well)
         shape = union([bottom_hull(
             [
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.bl_place(translate(self.thumb_post_tr(), wall_locate2(-0.3, 1))),
                 self.bl_place(translate(self.thumb_post_tr(), wall_locate3(-0.3, 1))),
             ]
@@ -271,8 +251,8 @@ class MinidoxCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                                self.ml_place(translate(self.thumb_post_tr(), wall_locate2(-0.3, 1))),
                                self.ml_place(translate(self.thumb_post_tr(), wall_locate3(-0.3, 1))),
                                self.tl_place(self.thumb_post_tl()),
@@ -282,10 +262,10 @@ class MinidoxCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                                self.tl_place(self.thumb_post_tl()),
                            ]
                        )])
@@ -293,9 +273,9 @@ class MinidoxCluster(DefaultCluster):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                               key_place(web_post_bl(), 0, cornerrow),
+                               left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                               left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                               key_place(web_post_bl(), 0, self.config.cornerrow),
                                # key_place(translate(web_post_bl(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True),
                                self.tl_place(self.thumb_post_tl()),
                            ]
@@ -317,7 +297,7 @@ class MinidoxCluster(DefaultCluster):
     def screw_positions(self):
         position = self.thumborigin()
         position = list(np.array(position) + np.array([-37, -32, -16]))
-        position[1] = position[1] - .4 * (self.minidox_Usize - 1) * sa_length
+        position[1] = position[1] - .4 * (self.minidox_Usize - 1) * self.config.sa_length
         position[2] = 0
 
         return position
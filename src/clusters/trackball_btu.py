@@ -1,8 +1,8 @@
 from clusters.trackball_wilder import TrackballWild
-import json
-import os
+from clusters.default_cluster import build_names
 
 class TrackballBTU(TrackballWild):
+    # no settings file of its own, it reads TRACKBALL_WILD.json through TrackballWild
 
     post_offsets = [
             [14, 0, -2],
@@ -15,28 +15,9 @@ class TrackballBTU(TrackballWild):
     def name():
         return "TRACKBALL_BTU"
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "TRACKBALL_WILD.json"), mode='r') as fid:
-            data = json.load(fid)
-
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
-        super().__init__(parent_locals)
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+    def __init__(self, config, parent_locals):
+        super().__init__(config, parent_locals)
+        globals().update(build_names(config, parent_locals))
 
     def has_btus(self):
         return True
@@ -45,7 +26,7 @@ class TrackballBTU(TrackballWild):
         posts = [shape]
         all_pos = []
         for i in range(len(pos)):
-            all_pos.append(pos[i] + tb_socket_translation_offset[i])
+            all_pos.append(pos[i] + self.config.tb_socket_translation_offset[i])
         z_pos = abs(pos[2])
         for post_offset in self.post_offsets:
             support_z = z_pos + post_offset[2]
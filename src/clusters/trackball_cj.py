@@ -1,10 +1,10 @@
 from clusters.trackball_orbyl import TrackballOrbyl
+from clusters.default_cluster import build_names
 import math
-import json
-import os
 
 
 class TrackballCJ(TrackballOrbyl):
+    config_file = "TRACKBALL_CJ.json"
     tbcj_inner_diameter = 42
     tbcj_thickness = 2
     tbcj_outer_diameter = 53
@@ -13,30 +13,11 @@ class TrackballCJ(TrackballOrbyl):
     def name():
         return "TRACKBALL_CJ"
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "TRACKBALL_CJ.json"), mode='r') as fid:
-            data = json.load(fid)
+    def __init__(self, config, parent_locals):
+        super().__init__(config, parent_locals)
+        globals().update(build_names(config, parent_locals))
 
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
-        super().__init__(parent_locals)
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
-
-    def position_rotation(self):
+    def calc_position_rotation(self):
         pos = np.array([-15, -60, -12]) + self.thumborigin()
         rot = (0, 0, 0)
         return pos, rot
@@ -80,7 +61,7 @@ class TrackballCJ(TrackballOrbyl):
         return shape
 
     def track_place(self, shape):
-        loc = np.array([-15, -60, -12]) + self.thumborigin()
+        loc, rot = self.position_rotation()
         shape = translate(shape, loc)
         shape = rotate(shape, (0, 0, 0))
         return shape
@@ -94,17 +75,17 @@ class TrackballCJ(TrackballOrbyl):
         ])
 
     def tbcj_edge_post(self, i):
-        shape = box(post_size, post_size, self.tbcj_thickness)
+        shape = box(self.config.post_size, self.config.post_size, self.tbcj_thickness)
         shape = self.oct_corner(i, self.tbcj_outer_diameter, shape)
         return shape
 
     def tbcj_web_post(self, i):
-        shape = box(post_size, post_size, self.tbcj_thickness)
+        shape = box(self.config.post_size, self.config.post_size, self.tbcj_thickness)
         shape = self.oct_corner(i, self.tbcj_outer_diameter, shape)
         return shape
 
     def tbcj_holder(self):
-        center = box(post_size, post_size, self.tbcj_thickness)
+        center = box(self.config.post_size, self.config.post_size, self.tbcj_thickness)
 
         shape = []
         for i in range(8):
@@ -180,26 +161,26 @@ class TrackballCJ(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_place(web_post_tl()),
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.tl_place(web_post_tr()),
-                    key_place(web_post_br(), 0, cornerrow),
+                    key_place(web_post_br(), 0, self.config.cornerrow),
                     self.tr_place(web_post_tl()),
-                    key_place(web_post_bl(), 1, cornerrow),
+                    key_place(web_post_bl(), 1, self.config.cornerrow),
                     self.tr_place(web_post_tr()),
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tr_place(web_post_tr()),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tr_place(web_post_br()),
-                    key_place(web_post_br(), 2, lastrow),
-                    key_place(web_post_bl(), 3, lastrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -207,12 +188,12 @@ class TrackballCJ(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -220,10 +201,10 @@ class TrackballCJ(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, lastrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -270,7 +251,7 @@ class TrackballCJ(TrackballOrbyl):
                     self.tr_place(web_post_br()),
                     self.track_place(self.tbcj_web_post(0)),
                     self.tr_place(web_post_br()),
-                    key_place(web_post_bl(), 3, lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
                 ]
             )
         )
@@ -300,7 +281,7 @@ class TrackballCJ(TrackballOrbyl):
             (self.track_place, 0, -1, self.tbcj_web_post(2)),
             (self.track_place, 1, -1, self.tbcj_web_post(1)),
             (self.track_place, 1, 0, self.tbcj_web_post(0)),
-            ((lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()),
+            ((lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1, web_post_bl()),
         ]
         for i, _ in enumerate(points[:-1]):
             (pa, dxa, dya, sa) = points[i]
@@ -315,8 +296,8 @@ class TrackballCJ(TrackballOrbyl):
         # clunky bit on the top left thumb connection  (normal connectors don't work well)
         shape = union([bottom_hull(
             [
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
                 self.ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             ]
@@ -325,9 +306,9 @@ class TrackballCJ(TrackballOrbyl):
         shape = union([shape,
                        hull_from_shapes(
                            [
-                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True,
+                               left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True,
                                               side=side),
-                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True,
+                               left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True,
                                               side=side),
                                self.ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
                                self.ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
@@ -338,18 +319,18 @@ class TrackballCJ(TrackballOrbyl):
 
         shape = union([shape, hull_from_shapes(
             [
-                left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate2(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate3(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
                 self.tl_place(web_post_tl()),
             ]
         )])
 
         shape = union([shape, hull_from_shapes(
             [
-                left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
-                left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
-                key_place(web_post_bl(), 0, cornerrow),
+                left_key_place(web_post(), self.config.cornerrow, -1, low_corner=True, side=side),
+                left_key_place(translate(web_post(), wall_locate1(-1, 0)), self.config.cornerrow, -1, low_corner=True, side=side),
+                key_place(web_post_bl(), 0, self.config.cornerrow),
                 self.tl_place(web_post_tl()),
             ]
         )])
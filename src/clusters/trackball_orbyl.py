@@ -1,9 +1,8 @@
-from clusters.default_cluster import DefaultCluster
-import json
-import os
+from clusters.default_cluster import DefaultCluster, build_names
 
 
 class TrackballOrbyl(DefaultCluster):
+    config_file = "TRACKBALL_ORBYL.json"
     key_diameter = 75
     translation_offset = [
         0,
@@ -64,32 +63,16 @@ class TrackballOrbyl(DefaultCluster):
     def name():
         return "TRACKBALL_ORBYL"
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "TRACKBALL_ORBYL.json"), mode='r') as fid:
-            data = json.load(fid)
-
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
+    def __init__(self, config, parent_locals):
         self.num_keys = 4
         self.is_tb = True
-        super().__init__(parent_locals)
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
+        super().__init__(config, parent_locals)
+        globals().update(build_names(config, parent_locals))
 
     def position_rotation(self):
+        return self.cached('position_rotation', self.calc_position_rotation)
+
+    def calc_position_rotation(self):
         rot = [10, -15, 5]
         pos = self.thumborigin()
         # Changes size based on key diameter around ball, shifting off of the top left cluster key.
@@ -168,47 +151,47 @@ class TrackballOrbyl(DefaultCluster):
 
     def tb_post_r(self):
         debugprint('post_r()')
-        radius = ball_diameter/2 + ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2 + self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [1.0*(radius - post_adj), 0.0*(radius - post_adj), 0]
+                         [1.0*(radius - self.config.post_adj), 0.0*(radius - self.config.post_adj), 0]
                          )
 
     def tb_post_tr(self):
         debugprint('post_tr()')
-        radius = ball_diameter/2+ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2+self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [0.5*(radius - post_adj), 0.866*(radius - post_adj), 0]
+                         [0.5*(radius - self.config.post_adj), 0.866*(radius - self.config.post_adj), 0]
                          )
 
 
     def tb_post_tl(self):
         debugprint('post_tl()')
-        radius = ball_diameter/2+ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2+self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [-0.5*(radius - post_adj), 0.866*(radius - post_adj), 0]
+                         [-0.5*(radius - self.config.post_adj), 0.866*(radius - self.config.post_adj), 0]
                          )
 
 
     def tb_post_l(self):
         debugprint('post_l()')
-        radius = ball_diameter/2+ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2+self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [-1.0*(radius - post_adj), 0.0*(radius - post_adj), 0]
+                         [-1.0*(radius - self.config.post_adj), 0.0*(radius - self.config.post_adj), 0]
                          )
 
     def tb_post_bl(self):
         debugprint('post_bl()')
-        radius = ball_diameter/2+ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2+self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [-0.5*(radius - post_adj), -0.866*(radius - post_adj), 0]
+                         [-0.5*(radius - self.config.post_adj), -0.866*(radius - self.config.post_adj), 0]
                          )
 
 
     def tb_post_br(self):
         debugprint('post_br()')
-        radius = ball_diameter/2+ball_wall_thickness + ball_gap
+        radius = self.config.ball_diameter/2+self.config.ball_wall_thickness + self.config.ball_gap
         return translate(web_post(),
-                         [0.5*(radius - post_adj), -0.866*(radius - post_adj), 0]
+                         [0.5*(radius - self.config.post_adj), -0.866*(radius - self.config.post_adj), 0]
                          )
 
     def thumb(self, side="right"):
@@ -246,7 +229,7 @@ class TrackballOrbyl(DefaultCluster):
                     self.track_place(self.tb_post_r()),
                     self.tl_place(web_post_bl()),
                     self.track_place(self.tb_post_tr()),
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.track_place(self.tb_post_tl()),
                 ]
             )
@@ -290,12 +273,12 @@ class TrackballOrbyl(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -303,10 +286,10 @@ class TrackballOrbyl(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, lastrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -318,7 +301,7 @@ class TrackballOrbyl(DefaultCluster):
         # thumb, walls
         shape = wall_brace(
             self.mr_place, .5, 1, web_post_tr(),
-            (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl(),
+            (lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1, web_post_bl(),
         )
         shape = union([shape, wall_brace(
             self.mr_place, .5, 1, web_post_tr(),
@@ -339,7 +322,7 @@ class TrackballOrbyl(DefaultCluster):
 
         shape = union([shape, wall_brace(
             self.track_place, -1.5, 0, self.tb_post_tl(),
-            (lambda sh: left_key_place(sh, lastrow - 1, -1, side=ball_side, low_corner=True)), -1, 0, web_post(),
+            (lambda sh: left_key_place(sh, self.config.lastrow - 1, -1, side=self.config.ball_side, low_corner=True)), -1, 0, web_post(),
         )])
         shape = union([shape, wall_brace(
             self.track_place, -1.5, 0, self.tb_post_tl(),
@@ -363,8 +346,8 @@ class TrackballOrbyl(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_bl(), 0, cornerrow),
-                    left_key_place(web_post(), lastrow - 1, -1, side=side, low_corner=True),                # left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
+                    left_key_place(web_post(), self.config.lastrow - 1, -1, side=side, low_corner=True),                # left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True),
                     self.track_place(self.tb_post_tl()),
                 ]
             )
@@ -373,32 +356,32 @@ class TrackballOrbyl(DefaultCluster):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.tl_place(web_post_bl()),
-                    key_place(web_post_br(), 0, cornerrow),
+                    key_place(web_post_br(), 0, self.config.cornerrow),
                     self.tl_place(web_post_tl()),
-                    key_place(web_post_bl(), 1, cornerrow),
+                    key_place(web_post_bl(), 1, self.config.cornerrow),
                     self.tl_place(web_post_tl()),
-                    key_place(web_post_br(), 1, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
                     self.tl_place(web_post_tr()),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.tl_place(web_post_tr()),
-                    key_place(web_post_bl(), 2, lastrow),
+                    key_place(web_post_bl(), 2, self.config.lastrow),
                     self.mr_place(web_post_tl()),
-                    key_place(web_post_br(), 2, lastrow),
-                    key_place(web_post_bl(), 3, lastrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.lastrow),
                     self.mr_place(web_post_tr()),
                     self.mr_place(web_post_tl()),
-                    key_place(web_post_br(), 2, lastrow),
-
-                    key_place(web_post_bl(), 3, lastrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+
+                    key_place(web_post_bl(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
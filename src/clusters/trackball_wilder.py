@@ -1,9 +1,9 @@
 from clusters.trackball_orbyl import TrackballOrbyl
-import json
-import os
+from clusters.default_cluster import build_names
 
 
 class TrackballWild(TrackballOrbyl):
+    config_file = "TRACKBALL_WILD.json"
     key_to_thumb_rotation = [] # may no longer be used?
     post_offsets = [
             [14, -8, 3],
@@ -40,30 +40,11 @@ class TrackballWild(TrackballOrbyl):
         return "TRACKBALL_WILD"
 
 
-    def get_config(self):
-        with open(os.path.join("src", "clusters", "json", "TRACKBALL_WILD.json"), mode='r') as fid:
-            data = json.load(fid)
+    def __init__(self, config, parent_locals):
+        super().__init__(config, parent_locals)
+        globals().update(build_names(config, parent_locals))
 
-        superdata = super().get_config()
-
-        # overwrite any super variables with this class' needs
-        for item in data:
-            superdata[item] = data[item]
-
-        for item in superdata:
-            if not hasattr(self, str(item)):
-                print(self.name() + ": NO MEMBER VARIABLE FOR " + str(item))
-                continue
-            setattr(self, str(item), superdata[item])
-
-        return superdata
-
-    def __init__(self, parent_locals):
-        super().__init__(parent_locals)
-        for item in parent_locals:
-            globals()[item] = parent_locals[item]
-
-    def position_rotation(self):
+    def calc_position_rotation(self):
         rot = [10, -15, 5]
         pos = self.thumborigin()
         # Changes size based on key diameter around ball, shifting off of the top left cluster key.
@@ -155,7 +136,7 @@ class TrackballWild(TrackballOrbyl):
                     self.track_place(self.tb_post_r()),
                     self.tl_place(web_post_bl()),
                     self.track_place(self.tb_post_tr()),
-                    key_place(web_post_bl(), 0, cornerrow),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
                     self.track_place(self.tb_post_tl()),
                 ]
             )
@@ -199,12 +180,12 @@ class TrackballWild(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 1, cornerrow),
-                    key_place(web_post_tl(), 2, lastrow),
-                    key_place(web_post_bl(), 2, cornerrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_br(), 2, cornerrow),
-                    key_place(web_post_bl(), 3, cornerrow),
+                    key_place(web_post_br(), 1, self.config.cornerrow),
+                    key_place(web_post_tl(), 2, self.config.lastrow),
+                    key_place(web_post_bl(), 2, self.config.cornerrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_br(), 2, self.config.cornerrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
                 ]
             )
         )
@@ -212,10 +193,10 @@ class TrackballWild(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, lastrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -228,7 +209,7 @@ class TrackballWild(TrackballOrbyl):
         # thumb, walls
         shape = wall_brace(
             self.mr_place, .5, 1, web_post_tl(),
-            (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl(),
+            (lambda sh: key_place(sh, 3, self.config.lastrow)), 0, -1, web_post_bl(),
         )
         shape = union([shape, wall_brace(
             self.mr_place, .5, 1, web_post_tl(),
@@ -257,7 +238,7 @@ class TrackballWild(TrackballOrbyl):
         # TOP LEFT BEHIND TRACKBALL
         shape = union([shape, wall_brace(
             self.track_place, -1.5, 0, self.tb_post_tl(),
-            (lambda sh: left_key_place(sh, lastrow - 1, -1, side=ball_side, low_corner=True)), -1, 0, web_post(),
+            (lambda sh: left_key_place(sh, self.config.lastrow - 1, -1, side=self.config.ball_side, low_corner=True)), -1, 0, web_post(),
         )])
         # LEFT OF TRACKBALL
         shape = union([shape, wall_brace(
@@ -321,8 +302,8 @@ class TrackballWild(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_bl(), 0, cornerrow),
-                    left_key_place(web_post(), lastrow - 1, -1, side=side, low_corner=True),
+                    key_place(web_post_bl(), 0, self.config.cornerrow),
+                    left_key_place(web_post(), self.config.lastrow - 1, -1, side=side, low_corner=True),
                     # left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True),
                     self.track_place(self.tb_post_tl()),
                 ]
@@ -332,9 +313,9 @@ class TrackballWild(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_bl(), 0, cornerrow),  # col 0 bottom, bottom left (at left side/edge)
+                    key_place(web_post_bl(), 0, self.config.cornerrow),  # col 0 bottom, bottom left (at left side/edge)
                     self.tl_wall(web_post_bl()),  # top cluster key, bottom left (sort of top left)
-                    key_place(web_post_bl(), 1, cornerrow),  # col 1 bottom, bottom left
+                    key_place(web_post_bl(), 1, self.config.cornerrow),  # col 1 bottom, bottom left
                     self.tl_wall(web_post_tl())
                 ]
             )
@@ -344,8 +325,8 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tl()),
-                    key_place(web_post_bl(), 1, cornerrow),  # col 1 bottom, bottom right corner
-                    key_place(web_post_br(), 1, cornerrow),  # col 1 bottom, bottom left corner
+                    key_place(web_post_bl(), 1, self.config.cornerrow),  # col 1 bottom, bottom right corner
+                    key_place(web_post_br(), 1, self.config.cornerrow),  # col 1 bottom, bottom left corner
                     self.tl_wall(web_post_tl())
                 ]
             )
@@ -355,8 +336,8 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tl()),
-                    key_place(web_post_tl(), 2, lastrow),  # col 2 bottom, top left corner
-                    key_place(web_post_bl(), 2, lastrow),  # col 2 bottom, bottom left corner
+                    key_place(web_post_tl(), 2, self.config.lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 2, self.config.lastrow),  # col 2 bottom, bottom left corner
                     self.tl_wall(web_post_tl())
                 ]
             )
@@ -366,8 +347,8 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tl()),
-                    key_place(web_post_tl(), 2, lastrow),  # col 2 bottom, top left corner
-                    key_place(web_post_br(), 1, cornerrow),  # col 2 bottom, bottom left corner
+                    key_place(web_post_tl(), 2, self.config.lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_br(), 1, self.config.cornerrow),  # col 2 bottom, bottom left corner
                     self.tl_wall(web_post_tl())
                 ]
             )
@@ -377,7 +358,7 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tl()),
-                    key_place(web_post_bl(), 2, lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 2, self.config.lastrow),  # col 2 bottom, top left corner
                     self.tl_wall(web_post_tr()),  # col 2 bottom, bottom left corner
                     self.tl_wall(web_post_tl())
                 ]
@@ -388,8 +369,8 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_bl(), 2, lastrow),  # col 2 bottom, top left corner
-                    key_place(web_post_br(), 2, lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 2, self.config.lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_br(), 2, self.config.lastrow),  # col 2 bottom, top left corner
                     self.tl_wall(web_post_tr())  # col 2 bottom, bottom left corner
                 ]
             )
@@ -399,8 +380,8 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_br(), 2, lastrow),  # col 2 bottom, top left corner
-                    key_place(web_post_bl(), 3, lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_br(), 2, self.config.lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 3, self.config.lastrow),  # col 2 bottom, top left corner
                     self.tl_wall(web_post_tr())  # col 2 bottom, bottom left corner
                 ]
             )
@@ -410,7 +391,7 @@ class TrackballWild(TrackballOrbyl):
             triangle_hulls(
                 [
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_bl(), 3, lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 3, self.config.lastrow),  # col 2 bottom, top left corner
                     self.mr_wall(web_post_tl()),
                     self.tl_wall(web_post_tr())  # col 2 bottom, bottom left corner
                 ]
@@ -422,7 +403,7 @@ class TrackballWild(TrackballOrbyl):
             translate(triangle_hulls(
                 [
                     self.tl_wall(web_post_tr()),
-                    key_place(web_post_bl(), 3, lastrow),  # col 2 bottom, top left corner
+                    key_place(web_post_bl(), 3, self.config.lastrow),  # col 2 bottom, top left corner
                     self.mr_wall(web_post_tl()),
                     self.tl_wall(web_post_tr())  # col 2 bottom, bottom left corner
                 ]
@@ -456,15 +437,15 @@ class TrackballWild(TrackballOrbyl):
         hulls.append(
             triangle_hulls(
                 [
-                    key_place(web_post_br(), 2, lastrow),
-
-                    key_place(web_post_bl(), 3, lastrow),
-                    key_place(web_post_tr(), 2, lastrow),
-                    key_place(web_post_tl(), 3, lastrow),
-                    key_place(web_post_bl(), 3, cornerrow),
-                    key_place(web_post_tr(), 3, lastrow),
-                    key_place(web_post_br(), 3, cornerrow),
-                    key_place(web_post_bl(), 4, cornerrow),
+                    key_place(web_post_br(), 2, self.config.lastrow),
+
+                    key_place(web_post_bl(), 3, self.config.lastrow),
+                    key_place(web_post_tr(), 2, self.config.lastrow),
+                    key_place(web_post_tl(), 3, self.config.lastrow),
+                    key_place(web_post_bl(), 3, self.config.cornerrow),
+                    key_place(web_post_tr(), 3, self.config.lastrow),
+                    key_place(web_post_br(), 3, self.config.cornerrow),
+                    key_place(web_post_bl(), 4, self.config.cornerrow),
                 ]
             )
         )
@@ -475,7 +456,7 @@ class TrackballWild(TrackballOrbyl):
         posts = [shape]
         all_pos = []
         for i in range(len(pos)):
-            all_pos.append(pos[i] + tb_socket_translation_offset[i])
+            all_pos.append(pos[i] + self.config.tb_socket_translation_offset[i])
         z_pos = abs(pos[2])
         for post_offset in self.post_offsets:
             support_z = z_pos + post_offset[2]
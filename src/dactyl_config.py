@@ -0,0 +1,168 @@
+import copy
+import hashlib
+import json
+import numpy as np
+
+# Settings of one build, frozen: the defaults of generate_configuration.shape_config with the build's json config
+# (and its override file) on top, plus the values make_dactyl works out from them, computed once here.  Configs
+# with the same settings are equal and hash alike, the digest names a configuration in caches and logs.
+#
+#   config = DactylConfig(shape_config, data)
+#   config.nrows, config.mount_width   ->  settings and derived values
+#   config.settings()                  ->  a fresh dict of the settings, safe to change
+#   config.diff(other)                 ->  {name: (value here, value in other)} for every setting that differs
+#
+# The thumb clusters and the stage cache are handed the config and read their settings from it.
+
+
+class DactylConfig(object):
+    def __init__(self, *layers):
+        settings = {}
+        for layer in layers:
+            settings.update(copy.deepcopy(dict(layer)))
+        object.__setattr__(self, "_settings", settings)
+        try:
+            derived = derive(settings)
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as err:
+            raise ValueError("invalid settings, the derived values cannot be worked out: {!r}".format(err)) from err
+        object.__setattr__(self, "_derived", derived)
+        object.__setattr__(self, "digest", hashlib.sha1(canonical(settings).encode()).hexdigest())
+
+    def __getattr__(self, name):
+        # only called for names that are not attributes of the object
+        if name.startswith('_'):
+            raise AttributeError(name)
+        for values in [self._derived, self._settings]:
+            if name in values:
+                return copy.deepcopy(values[name])
+        raise AttributeError("no setting named {}".format(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DactylConfig is frozen, build a new one to change {}".format(name))
+
+    def __delattr__(self, name):
+        raise AttributeError("DactylConfig is frozen, build a new one to change {}".format(name))
+
+    def __eq__(self, other):
+        return isinstance(other, DactylConfig) and self.digest == other.digest
+
+    def __hash__(self):
+        return int(self.digest[:16], 16)
+
+    def __contains__(self, name):
+        return name in self._settings
+
+    def provides(self, name):
+        # a setting, a derived value or a value of the selected oled mount
+        return name in self._settings or name in self._derived or name in self._oled_mount()
+
+    def __repr__(self):
+        return "DactylConfig({})".format(self.digest[:12])
+
+    def get(self, name, default=None):
+        if name in self._settings:
+            return copy.deepcopy(self._settings[name])
+        return default
+
+    def settings(self):
+        return copy.deepcopy(self._settings)
+
+    def derived(self):
+        return copy.deepcopy(self._derived)
+
+    def oled_settings(self):
+        return copy.deepcopy(self._oled_mount())
+
+    def _oled_mount(self):
+        # values of the selected oled mount, empty without one
+        oled_mount_type = self._settings.get("oled_mount_type")
+        if oled_mount_type is None or oled_mount_type == "NONE":
+            return {}
+        return self._settings["oled_configurations"][oled_mount_type]
+
+    def replace(self, **changes):
+        return DactylConfig(self._settings, changes)
+
+    def diff(self, other):
+        changes = {}
+        for name in sorted(set(self._settings) | set(other._settings)):
+            mine = self._settings.get(name)
+            theirs = other._settings.get(name)
+            if canonical(mine) != canonical(theirs):
+                changes[name] = (copy.deepcopy(mine), copy.deepcopy(theirs))
+        return changes
+
+
+def canonical(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def derive(settings):
+    # the values make_dactyl used to work out at the start of every build
+    s = settings
+    derived = {}
+
+    nrows = s["nrows"]
+    derived["centerrow"] = nrows - s["centerrow_offset"]
+    derived["lastrow"] = nrows - 1
+    derived["cornerrow"] = nrows - 2
+    derived["lastcol"] = s["ncols"] - 1
+    derived["oled_row"] = nrows - 1
+
+    plate_style = s["plate_style"]
+    if plate_style in ['NUB', 'HS_NUB']:
+        keyswitch_height = s["nub_keyswitch_height"]
+        keyswitch_width = s["nub_keyswitch_width"]
+    elif plate_style in ['UNDERCUT', 'HS_UNDERCUT', 'NOTCH', 'HS_NOTCH']:
+        keyswitch_height = s["undercut_keyswitch_height"]
+        keyswitch_width = s["undercut_keyswitch_width"]
+    else:
+        keyswitch_height = s["hole_keyswitch_height"]
+        keyswitch_width = s["hole_keyswitch_width"]
+    derived["keyswitch_height"] = keyswitch_height
+    derived["keyswitch_width"] = keyswitch_width
+
+    mount_width = keyswitch_width + 2 * s["plate_rim"]
+    mount_height = keyswitch_height + 2 * s["plate_rim"]
+    derived["mount_width"] = mount_width
+    derived["mount_height"] = mount_height
+    derived["mount_thickness"] = s["plate_thickness"]
+
+    sa_double_length = s["sa_double_length"]
+    if s["default_1U_cluster"] and s["thumb_style"] == 'DEFAULT':
+        derived["double_plate_height"] = (.7 * sa_double_length - mount_height) / 3
+    elif s["thumb_style"] == 'DEFAULT':
+        derived["double_plate_height"] = (.90 * sa_double_length - mount_height) / 3
+    else:
+        derived["double_plate_height"] = (sa_double_length - mount_height) / 3
+
+    # fixed left wall, the settings of the same names have never been read by the build
+    derived["left_wall_x_offset"] = 8
+    derived["left_wall_x_row_offsets"] = [8, 8, 8, 8, 8, 8]
+    derived["left_wall_z_offset"] = 3
+    derived["left_wall_lower_y_offset"] = 0
+    derived["left_wall_lower_z_offset"] = 0
+    oled_mount_type = s["oled_mount_type"]
+    if oled_mount_type is not None and oled_mount_type != "NONE":
+        oled = s["oled_configurations"][oled_mount_type]
+        derived["left_wall_x_offset"] = oled["oled_left_wall_x_offset_override"]
+        if nrows == 4:
+            derived["left_wall_x_row_offsets"] = [22, 22, 22, 22]
+        elif nrows == 5:
+            derived["left_wall_x_row_offsets"] = [22, 22, 22, 8, 8]
+        elif nrows == 6:
+            derived["left_wall_x_row_offsets"] = [22, 22, 22, 8, 8, 8]
+        derived["left_wall_z_offset"] = oled["oled_left_wall_z_offset_override"]
+        derived["left_wall_lower_y_offset"] = oled["oled_left_wall_lower_y_offset"]
+        derived["left_wall_lower_z_offset"] = oled["oled_left_wall_lower_z_offset"]
+
+    alpha = s["alpha"]
+    beta = s["beta"]
+    cap_top_height = s["plate_thickness"] + s["sa_profile_key_height"]
+    column_radius = ((mount_width + s["extra_width"]) / 2) / (np.sin(beta / 2)) + cap_top_height
+    derived["cap_top_height"] = cap_top_height
+    derived["row_radius"] = ((mount_height + s["extra_height"]) / 2) / (np.sin(alpha / 2)) + cap_top_height
+    derived["column_radius"] = column_radius
+    derived["column_x_delta"] = -1 - column_radius * np.sin(beta)
+    derived["column_base_angle"] = beta * (s["centercol"] - 2)
+    return derived
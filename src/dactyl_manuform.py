@@ -4,16 +4,16 @@ import os.path as path
 import getopt, sys
 import json
 import os
+import time
 import importlib
-from clusters.default_cluster import DefaultCluster
-from clusters.carbonfet import CarbonfetCluster
-from clusters.mini import MiniCluster
-from clusters.minidox import MinidoxCluster
-from clusters.trackball_orbyl import TrackballOrbyl
-from clusters.trackball_wilder import TrackballWild
-from clusters.trackball_cj import TrackballCJ
-from clusters.custom_cluster import CustomCluster
-from clusters.trackball_btu import TrackballBTU
+import inspect
+from stage_cache import StageCache, imported_files, stat_files
+from transforms import identity_matrix, rotation_matrix, translation_matrix, transform_point
+from build_pool import fork_available, run_forked
+from build_trace import BuildTrace
+import footprint
+from clusters import cluster_class
+from dactyl_config import DactylConfig
 
 
 def deg2rad(degrees: float) -> float:
@@ -32,6 +32,51 @@ def debugprint(info):
     if debug_trace:
         print(info)
 
+# config settings read by each cached model_side stage, see stage_cache.py.
+# a setting missing from a list means changing it will not rebuild that stage.
+key_geometry_settings = [
+    'ENGINE', 'quick_render', 'nrows', 'ncols', 'alpha', 'beta', 'centercol', 'centerrow_offset',
+    'tenting_angle', 'column_style_gt5', 'column_style', 'column_offsets', 'full_last_rows',
+    'keyboard_z_offset', 'fixed_angles', 'fixed_x', 'fixed_z', 'fixed_tenting', 'extra_width', 'extra_height',
+    'pinky_1_5U', 'first_1_5U_row', 'last_1_5U_row', 'plate_style', 'hole_keyswitch_height',
+    'hole_keyswitch_width', 'nub_keyswitch_height', 'nub_keyswitch_width', 'undercut_keyswitch_height',
+    'undercut_keyswitch_width', 'sa_profile_key_height', 'sa_length', 'sa_double_length', 'plate_thickness',
+    'plate_rim', 'web_thickness', 'post_size', 'post_adj',
+]
+plate_settings = [
+    'plate_file_name', 'plate_offset', 'notch_width', 'clip_thickness', 'clip_undercut', 'undercut_transition',
+    'plate_holes', 'plate_holes_xy_offset', 'plate_holes_width', 'plate_holes_height', 'plate_holes_diameter',
+    'plate_holes_depth',
+]
+thumb_settings = [
+    'thumb_style', 'other_thumb', 'default_1U_cluster', 'minidox_Usize', 'trackball_Usize', 'ball_side',
+    'ball_diameter', 'ball_wall_thickness', 'ball_gap', 'trackball_modular', 'trackball_hole_diameter',
+    'trackball_hole_height', 'trackball_plate_thickness', 'trackball_plate_width', 'tbjs_key_diameter',
+    'tbjs_translation_offset', 'tbjs_rotation_offset', 'tbjs_key_translation_offsets',
+    'tbjs_key_rotation_offsets', 'tbcj_inner_diameter', 'tbcj_thickness', 'tbcj_outer_diameter',
+]
+wall_settings = [
+    'wall_z_offset', 'wall_x_offset', 'wall_y_offset', 'wall_thickness', 'wall_base_y_thickness',
+    'wall_base_x_thickness', 'wall_base_back_thickness', 'oled_mount_type', 'oled_configurations',
+    'trackball_in_wall', 'ball_side', 'tbiw_left_wall_x_offset_override', 'tbiw_left_wall_z_offset_override',
+    'tbiw_left_wall_lower_y_offset', 'tbiw_left_wall_lower_z_offset',
+]
+screw_settings = [
+    'screws_offset', 'screw_insert_height', 'screw_insert_bottom_radius', 'screw_insert_top_radius',
+    'screw_offsets',
+]
+oled_settings = [
+    'oled_mount_type', 'oled_center_row', 'oled_translation_offset', 'oled_rotation_offset', 'oled_configurations',
+    'trackball_in_wall', 'ball_side', 'tbiw_oled_center_row', 'tbiw_oled_translation_offset',
+    'tbiw_oled_rotation_offset', 'tbiw_left_wall_x_offset_override',
+]
+trackball_settings = [
+    'trackball_in_wall', 'tbiw_ball_center_row', 'tbiw_translational_offset', 'tbiw_rotation_offset',
+    'tbiw_left_wall_x_offset_override', 'tb_socket_translation_offset',
+    'tb_socket_rotation_offset', 'tb_btu_socket_translation_offset', 'tb_btu_socket_rotation_offset',
+    'tb_sensor_translation_offset', 'tb_sensor_rotation_offset', 'resin',
+]
+
 ###############################################
 # EXTREMELY UGLY BUT FUNCTIONAL BOOTSTRAP
 ###############################################
@@ -39,18 +84,10 @@ def debugprint(info):
 ## IMPORT DEFAULT CONFIG IN CASE NEW PARAMETERS EXIST
 
 
-def make_dactyl():
+def make_dactyl(config_data=None):
     right_cluster = None
     left_cluster = None
 
-    left_wall_x_offset = 8
-    left_wall_x_row_offsets = [
-        8, 8, 8, 8, 8, 8
-    ]
-    left_wall_z_offset = 3
-    left_wall_lower_y_offset = 0
-    left_wall_lower_z_offset = 0
-
     symmetry = None
     column_style = None
     save_path = path.join(r".", "things")
@@ -59,27 +96,31 @@ def make_dactyl():
         return right_cluster if side == "right" else left_cluster
 
     import generate_configuration as cfg
-    for item in cfg.shape_config:
-        globals()[item] = cfg.shape_config[item]
 
     data = None
 
+    if isinstance(config_data, DactylConfig):
+        data = config_data.settings()
+    elif config_data is not None:
+        # config passed in memory (bulk / release builds), command line and run_config.json are not read
+        data = dict(config_data)
+    else:
         ## CHECK FOR CONFIG FILE AND WRITE TO ANY VARIABLES IN FILE.
-    opts, args = getopt.getopt(sys.argv[1:], "", ["config=", "save_path="])
-    for opt, arg in opts:
-        if opt in '--config':
-            with open(os.path.join(r".", "configs", arg + '.json'), mode='r') as fid:
-                data = json.load(fid)
-        elif opt in '--save_path':
-            print("save_path set to argument: ", arg)
-            save_path = arg
+        opts, args = getopt.getopt(sys.argv[1:], "", ["config=", "save_path="])
+        for opt, arg in opts:
+            if opt in '--config':
+                with open(os.path.join(r".", "configs", arg + '.json'), mode='r') as fid:
+                    data = json.load(fid)
+            elif opt in '--save_path':
+                print("save_path set to argument: ", arg)
+                save_path = arg
 
     if data is None:
         print("NO CONFIGURATION SPECIFIED, USING run_config.json")
         with open(os.path.join("src", "run_config.json"), mode='r') as fid:
             data = json.load(fid)
 
-    if data["overrides"] not in [None, ""]:
+    if data.get("overrides") not in [None, ""]:
         save_path = path.join(save_path, data["overrides"])
         override_file = path.join(save_path, data["overrides"] + '.json')
         with open(override_file, mode='r') as fid:
@@ -87,8 +128,10 @@ def make_dactyl():
         for item in override_data:
             data[item] = override_data[item]
 
-    for item in data:
-        globals()[item] = data[item]
+    # defaults for settings the config leaves out, the build reads the settings as module globals
+    config = DactylConfig(cfg.shape_config, data)
+    print("CONFIGURATION {}".format(config.digest[:12]))
+    globals().update(config.settings())
 
     if save_name not in ['', None]:
         config_name = save_name
@@ -128,9 +171,34 @@ def make_dactyl():
     ####################################################
 
     if ENGINE == 'cadquery':
-        globals().update(importlib.import_module("helpers_cadquery").__dict__)
+        helpers = importlib.import_module("helpers_cadquery")
+        helpers.union_engine = union_engine
+        helpers.union_check = union_check
+        helpers.lazy_transforms = lazy_transforms
+        helpers.hull_engine = hull_engine
+        helpers.import_cache_dir = path.join(cache_dir, "imports") if import_cache else None
+        helpers.tess_tolerance = preview_tolerance if preview else None
+        helpers.tess_angular_tolerance = preview_angular_tolerance if preview else None
+    elif ENGINE == 'manifold':
+        helpers = importlib.import_module("helpers_manifold")
+        helpers.max_segments = preview_segments if preview else None
     else:
-        globals().update(importlib.import_module("helpers_solid").__dict__)
+        helpers = importlib.import_module("helpers_solid")
+        helpers.max_segments = preview_segments if preview else None
+        helpers.openscad_path = openscad_binary
+        helpers.render_backend = openscad_backend
+        helpers.render_workers = openscad_workers
+        helpers.scad_modules = scad_shared_modules
+    helpers.proxy_imports = preview and preview_proxies
+
+    globals().update(helpers.__dict__)
+
+    # on-disk cache of the model_side stages, keyed by the settings in the *_settings lists above
+    stages = StageCache(path.join(cache_dir, "stages"), config, save_shape, load_shape, enabled=stage_cache)
+    stage_code = imported_files([__file__, helpers.__file__], path.dirname(path.abspath(__file__)))
+
+    # wall / cpu time, peak memory and shape size of each named stage, written next to the exports
+    tracer = BuildTrace(enabled=trace_build, profile=trace_profile, count_shape=shape_counts)
 
     ####################################################
     # END HELPER FUNCTIONS
@@ -144,32 +212,21 @@ def make_dactyl():
     except NameError:
         quickly = False
 
-    if oled_mount_type is not None and oled_mount_type != "NONE":
-        for item in oled_configurations[oled_mount_type]:
-            globals()[item] = oled_configurations[oled_mount_type][item]
+    globals().update(config.oled_settings())
 
     if nrows > 5:
         column_style = column_style_gt5
 
-    centerrow = nrows - centerrow_offset
-
-    lastrow = nrows - 1
-    cornerrow = lastrow - 1
-    lastcol = ncols - 1
-
-    oled_row = nrows - 1
+    # values worked out from the settings, see dactyl_config.py
+    centerrow = config.centerrow
+    lastrow = config.lastrow
+    cornerrow = config.cornerrow
+    lastcol = config.lastcol
+    oled_row = config.oled_row
     plate_file = None
 
-    # Derived values
-    if plate_style in ['NUB', 'HS_NUB']:
-        keyswitch_height = nub_keyswitch_height
-        keyswitch_width = nub_keyswitch_width
-    elif plate_style in ['UNDERCUT', 'HS_UNDERCUT', 'NOTCH', 'HS_NOTCH']:
-        keyswitch_height = undercut_keyswitch_height
-        keyswitch_width = undercut_keyswitch_width
-    else:
-        keyswitch_height = hole_keyswitch_height
-        keyswitch_width = hole_keyswitch_width
+    keyswitch_height = config.keyswitch_height
+    keyswitch_width = config.keyswitch_width
 
     if plate_style in "AMOEBA":
         symmetry = "asymmetric"
@@ -185,38 +242,22 @@ def make_dactyl():
     if (trackball_in_wall or ('TRACKBALL' in thumb_style)) and not ball_side == 'both':
         symmetry = "asymmetric"
 
-    mount_width = keyswitch_width + 2 * plate_rim
-    mount_height = keyswitch_height + 2 * plate_rim
-    mount_thickness = plate_thickness
+    mount_width = config.mount_width
+    mount_height = config.mount_height
+    mount_thickness = config.mount_thickness
+    double_plate_height = config.double_plate_height
 
-    if default_1U_cluster and thumb_style == 'DEFAULT':
-        double_plate_height = (.7 * sa_double_length - mount_height) / 3
-        # double_plate_height = (.95 * sa_double_length - mount_height) / 3
-    elif thumb_style == 'DEFAULT':
-        double_plate_height = (.90 * sa_double_length - mount_height) / 3
-    else:
-        double_plate_height = (sa_double_length - mount_height) / 3
-
-    if oled_mount_type is not None and oled_mount_type != "NONE":
-        left_wall_x_offset = oled_left_wall_x_offset_override
-        if nrows == 4:
-            left_wall_x_row_offsets = [22, 22, 22, 22]
-        elif nrows == 5:
-            left_wall_x_row_offsets = [22, 22, 22, 8, 8]
-        elif nrows == 6:
-            left_wall_x_row_offsets = [22, 22, 22, 8, 8, 8]
-        # left_wall_x_row_offsets = [22 if row > oled_row else 8 for row in range(lastrow)]
-        left_wall_z_offset = oled_left_wall_z_offset_override
-        left_wall_lower_y_offset = oled_left_wall_lower_y_offset
-        left_wall_lower_z_offset = oled_left_wall_lower_z_offset
-
-    cap_top_height = plate_thickness + sa_profile_key_height
-    row_radius = ((mount_height + extra_height) / 2) / (np.sin(alpha / 2)) + cap_top_height
-    column_radius = (
-                            ((mount_width + extra_width) / 2) / (np.sin(beta / 2))
-                    ) + cap_top_height
-    column_x_delta = -1 - column_radius * np.sin(beta)
-    column_base_angle = beta * (centercol - 2)
+    left_wall_x_offset = config.left_wall_x_offset
+    left_wall_x_row_offsets = config.left_wall_x_row_offsets
+    left_wall_z_offset = config.left_wall_z_offset
+    left_wall_lower_y_offset = config.left_wall_lower_y_offset
+    left_wall_lower_z_offset = config.left_wall_lower_z_offset
+
+    cap_top_height = config.cap_top_height
+    row_radius = config.row_radius
+    column_radius = config.column_radius
+    column_x_delta = config.column_x_delta
+    column_base_angle = config.column_base_angle
 
     teensy_width = 20
     teensy_height = 12
@@ -243,7 +284,21 @@ def make_dactyl():
     # column_style='fixed'
 
 
+    # switch plates are identical for every key, build each variant once and place copies of it
+    plate_cache = {}
+
+
     def single_plate(cylinder_segments=100, side="right"):
+        key = (
+            plate_style, plate_file, plate_offset, mount_width, mount_height, mount_thickness,
+            keyswitch_width, keyswitch_height, cylinder_segments, side
+        )
+        if key not in plate_cache:
+            plate_cache[key] = build_single_plate(cylinder_segments=cylinder_segments, side=side)
+        return plate_cache[key]
+
+
+    def build_single_plate(cylinder_segments=100, side="right"):
         if plate_style in ['NUB', 'HS_NUB']:
             tb_border = (mount_height - keyswitch_height) / 2
             top_wall = box(mount_width, tb_border, plate_thickness)
@@ -317,7 +372,7 @@ def make_dactyl():
 
             undercut = translate(undercut, (0.0, 0.0, -clip_thickness + mount_thickness / 2.0))
 
-            if ENGINE == 'cadquery' and undercut_transition > 0:
+            if ENGINE == 'cadquery' and undercut_transition > 0 and not preview:
                 undercut = undercut.faces("+Z").chamfer(undercut_transition, clip_undercut)
 
             plate = difference(plate, [undercut])
@@ -591,21 +646,48 @@ def make_dactyl():
         return vals
 
 
+    # key placements as 4x4 matrices for the active column_style, one per (column, row) and built on first use.
+    # rows can be fractional, the OLED and trackball mounts sit between rows.
+    key_matrices = {}
+
+    def matrix_translate(matrix, vector):
+        return translation_matrix(vector) @ matrix
+
+    def matrix_rotate_x(matrix, angle):
+        return rotation_matrix([rad2deg(angle), 0, 0]) @ matrix
+
+    def matrix_rotate_y(matrix, angle):
+        return rotation_matrix([0, rad2deg(angle), 0]) @ matrix
+
+    def key_matrix(column, row):
+        if (column, row) not in key_matrices:
+            matrix = apply_key_geometry(
+                identity_matrix(), matrix_translate, matrix_rotate_x, matrix_rotate_y, column, row
+            )
+            matrix.flags.writeable = False
+            key_matrices[(column, row)] = matrix
+        return key_matrices[(column, row)]
+
     def key_position(position, column, row):
         debugprint('key_position()')
-        return apply_key_geometry(
-            position, add_translate, rotate_around_x, rotate_around_y, column, row
-        )
+        return transform_point(key_matrix(column, row), position)
+
+    def key_positions(points, keys):
+        # maps an (N, 3) array of local points through every (column, row) in keys in one call,
+        # returns a (len(keys), N, 3) array
+        matrices = np.array([key_matrix(column, row) for column, row in keys])
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        return np.einsum('kij,nj->kni', matrices[:, :3, :3], points) + matrices[:, None, :3, 3]
 
 
     def key_holes(side="right"):
         debugprint('key_holes()')
-        # hole = single_plate()
+        hole = single_plate(side=side)
         holes = []
         for column in range(ncols):
             for row in range(nrows):
                 if valid_key(column, row):
-                    holes.append(key_place(single_plate(side=side), column, row))
+                    holes.append(key_place(hole, column, row))
 
         shape = union(holes)
 
@@ -905,17 +987,17 @@ def make_dactyl():
     def back_wall():
         print("back_wall()")
         x = 0
-        shape = union([key_wall_brace(x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True)])
+        shapes = [key_wall_brace(x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True)]
         for i in range(ncols - 1):
             x = i + 1
-            shape = union([shape, key_wall_brace(x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True)])
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True))
+            shapes.append(key_wall_brace(
                 x, 0, 0, 1, web_post_tl(), x - 1, 0, 0, 1, web_post_tr(), back=True
-            )])
-        shape = union([shape, key_wall_brace(
+            ))
+        shapes.append(key_wall_brace(
             lastcol, 0, 0, 1, web_post_tr(), lastcol, 0, 1, 0, web_post_tr(), back=True
-        )])
-        return shape
+        ))
+        return union(shapes)
 
 
     def right_wall():
@@ -929,42 +1011,41 @@ def make_dactyl():
         tocol = lastcol
 
         y = 0
-        shape = union([
+        shapes = [
             key_wall_brace(
                 tocol, y, 1, 0, web_post_tr(), tocol, y, 1, 0, web_post_br()
             )
-        ])
+        ]
 
         for i in range(torow):
             y = i + 1
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(
                 tocol, y - 1, 1, 0, web_post_br(), tocol, y, 1, 0, web_post_tr()
-            )])
+            ))
 
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(
                 tocol, y, 1, 0, web_post_tr(), tocol, y, 1, 0, web_post_br()
-            )])
+            ))
             # STRANGE PARTIAL OFFSET
 
         if ncols > 4:
-            shape = union([
-                shape,
+            shapes.append(
                 key_wall_brace(lastcol, torow, 0, -1, web_post_br(), lastcol, torow, 1, 0, web_post_br())
-            ])
-        return shape
+            )
+        return union(shapes)
 
 
     def left_wall(side='right'):
         print('left_wall()')
-        shape = union([wall_brace(
+        shapes = [wall_brace(
             (lambda sh: key_place(sh, 0, 0)), 0, 1, web_post_tl(),
             (lambda sh: left_key_place(sh, 0, 1, side=side)), 0, 1, web_post(),
-        )])
+        )]
 
-        shape = union([shape, wall_brace(
+        shapes.append(wall_brace(
             (lambda sh: left_key_place(sh, 0, 1, side=side)), 0, 1, web_post(),
             (lambda sh: left_key_place(sh, 0, 1, side=side)), -1, 0, web_post(),
-        )])
+        ))
 
         for i in range(lastrow):
             y = i
@@ -979,8 +1060,8 @@ def make_dactyl():
                 left_key_place(web_post(), y, 1, side=side),
                 left_key_place(web_post(), y, -1, low_corner=low, side=side),
             ))
-            shape = union([shape, temp_shape1])
-            shape = union([shape, temp_shape2])
+            shapes.append(temp_shape1)
+            shapes.append(temp_shape2)
 
         for i in range(lastrow - 1):
             y = i + 1
@@ -996,10 +1077,10 @@ def make_dactyl():
                 left_key_place(web_post(), y - 1, -1, side=side),
                 left_key_place(web_post(), y - 1, -1, side=side),
             ))
-            shape = union([shape, temp_shape1])
-            shape = union([shape, temp_shape2])
+            shapes.append(temp_shape1)
+            shapes.append(temp_shape2)
 
-        return shape
+        return union(shapes)
 
 
     def front_wall():
@@ -1009,33 +1090,33 @@ def make_dactyl():
         if (full_last_rows):
             torow = lastrow
 
-        shape = union([
+        shapes = [
             key_wall_brace(
                 lastcol, 0, 0, 1, web_post_tr(), lastcol, 0, 1, 0, web_post_tr()
             )
-        ])
-        shape = union([shape, key_wall_brace(
+        ]
+        shapes.append(key_wall_brace(
             3, lastrow, 0, -1, web_post_bl(), 3, lastrow, 0.5, -1, web_post_br()
-        )])
-        shape = union([shape, key_wall_brace(
+        ))
+        shapes.append(key_wall_brace(
             3, lastrow, 0.5, -1, web_post_br(), 4, torow, 1, -1, web_post_bl()
-        )])
+        ))
 
         if ncols >= 4:
             for i in range(ncols - 4):
                 x = i + 4
-                shape = union([shape, key_wall_brace(
+                shapes.append(key_wall_brace(
                     x, torow, 0, -1, web_post_bl(), x, torow, 0, -1, web_post_br()
-                )])
+                ))
 
         if ncols >= 5:
             for i in range(ncols - 5):
                 x = i + 5
-                shape = union([shape, key_wall_brace(
+                shapes.append(key_wall_brace(
                     x, torow, 0, -1, web_post_bl(), x - 1, torow, 0, -1, web_post_br()
-                )])
+                ))
 
-        return shape
+        return union(shapes)
 
 
     def case_walls(side='right'):
@@ -1628,8 +1709,7 @@ def make_dactyl():
         return shape
 
 
-    def screw_insert(column, row, bottom_radius, top_radius, height, side='right'):
-        debugprint('screw_insert()')
+    def screw_insert_position(column, row, side='right'):
         shift_right = column == lastcol
         shift_left = column == 0
         shift_up = (not (shift_right or shift_left)) and (row == 0)
@@ -1682,6 +1762,13 @@ def make_dactyl():
                 row,
             )
 
+        return position
+
+
+    def screw_insert(column, row, bottom_radius, top_radius, height, side='right'):
+        debugprint('screw_insert()')
+        position = screw_insert_position(column, row, side=side)
+
         shape = screw_insert_shape(bottom_radius, top_radius, height)
         shape = translate(shape, [position[0], position[1], height / 2])
 
@@ -1696,21 +1783,30 @@ def make_dactyl():
         return shape
 
 
+    def screw_insert_locations(side='right'):
+        # x, y of each insert and the height of its base, screw_offsets included
+        so = screw_offsets
+        positions = (
+            screw_insert_position(0, 0, side=side),  # rear left
+            screw_insert_position(0, lastrow - 1, side=side),  # front left
+            screw_insert_position(3, lastrow, side=side),  # front middle
+            screw_insert_position(3, 0, side=side),  # rear middle
+            screw_insert_position(lastcol, 0, side=side),  # rear right
+            screw_insert_position(lastcol, lastrow - 1, side=side),  # front right
+            cluster(side).screw_positions(),  # thumb cluster
+        )
+        locations = []
+        for i, position in enumerate(positions):
+            y_offset = left_wall_lower_y_offset if i == 1 else 0
+            locations.append((position[0] + so[i][0], position[1] + so[i][1] + y_offset, so[i][2]))
+        return locations
+
+
     def screw_insert_all_shapes(bottom_radius, top_radius, height, offset=0, side='right'):
         print('screw_insert_all_shapes()')
-        so = screw_offsets
-        shape = (
-            translate(screw_insert(0, 0, bottom_radius, top_radius, height, side=side), (so[0][0], so[0][1], so[0][2] + offset)),  # rear left
-            translate(screw_insert(0, lastrow - 1, bottom_radius, top_radius, height, side=side),
-                      (so[1][0], so[1][1] + left_wall_lower_y_offset, so[1][2] + offset)),  # front left
-            translate(screw_insert(3, lastrow, bottom_radius, top_radius, height, side=side),
-                      (so[2][0], so[2][1], so[2][2] + offset)),  # front middle
-            translate(screw_insert(3, 0, bottom_radius, top_radius, height, side=side), (so[3][0], so[3][1], so[3][2] + offset)),  # rear middle
-            translate(screw_insert(lastcol, 0, bottom_radius, top_radius, height, side=side),
-                      (so[4][0], so[4][1], so[4][2] + offset)),  # rear right
-            translate(screw_insert(lastcol, lastrow - 1, bottom_radius, top_radius, height, side=side),
-                      (so[5][0], so[5][1], so[5][2] + offset)),  # front right
-            translate(screw_insert_thumb(bottom_radius, top_radius, height, side), (so[6][0], so[6][1], so[6][2] + offset)),  # thumb cluster
+        shape = tuple(
+            translate(screw_insert_shape(bottom_radius, top_radius, height), (x, y, z + height / 2 + offset))
+            for x, y, z in screw_insert_locations(side)
         )
 
         return shape
@@ -1722,13 +1818,12 @@ def make_dactyl():
         )
 
 
+    def screw_insert_outer_size():
+        return screw_insert_bottom_radius + 1.6, screw_insert_top_radius + 1.6, screw_insert_height + 1.5
+
+
     def screw_insert_outers(side='right'):
-        return screw_insert_all_shapes(
-            screw_insert_bottom_radius + 1.6,
-            screw_insert_top_radius + 1.6,
-            screw_insert_height + 1.5,
-            side=side
-        )
+        return screw_insert_all_shapes(*screw_insert_outer_size(), side=side)
 
 
     def screw_insert_screw_holes(side='right'):
@@ -1774,93 +1869,153 @@ def make_dactyl():
     #     return shape
 
 
+    def cluster_stage_info(side):
+        # cluster settings come from its json file and class attributes rather than the config
+        clust = cluster(side)
+        values = {
+            name: getattr(clust, name) for name in dir(clust)
+            if not name.startswith('_') and name != 'config' and not callable(getattr(clust, name))
+        }
+        code_files = [inspect.getfile(cls) for cls in type(clust).__mro__ if cls is not object]
+        return [clust.name(), values], code_files
+
+    def cached_stage(name, fields, builder, side, with_cluster=False, with_parts=False):
+        extra = [side]
+        if preview:
+            # preview stages are coarser, they are kept apart from the full builds
+            extra.append([preview_segments, preview_tolerance, preview_angular_tolerance, preview_proxies])
+        code_files = list(stage_code)
+        if with_cluster:
+            cluster_info, cluster_files = cluster_stage_info(side)
+            extra.append(cluster_info)
+            code_files += cluster_files
+        if with_parts:
+            extra.append(stat_files(parts_path))
+        return tracer.run(
+            name + "_" + side, lambda: stages.fetch(name + "_" + side, fields, code_files, builder, extra=extra)
+        )
+
+    # walls and screw insert outers of each side, shared by model_side and baseplate so they are built once per build
+    case_shells = {}
+    # points of the wall hulls of each side, for the 2D baseplate outline.  missing when the walls came
+    # from the stage cache, the baseplate then cuts the 3D case instead.
+    wall_footprints = {}
+
+    def case_shell(side="right"):
+        if side in case_shells:
+            return case_shells[side]
+
+        wall_fields = key_geometry_settings + thumb_settings + wall_settings
+
+        def shell_shape():
+            if ENGINE == 'cadquery' and baseplate_footprint:
+                helpers.footprint_hulls = []
+            try:
+                walls_shape = cached_stage(
+                    "case_walls", wall_fields, lambda: case_walls(side=side), side, with_cluster=True
+                )
+            finally:
+                if ENGINE == 'cadquery':
+                    if helpers.footprint_hulls:
+                        wall_footprints[side] = helpers.footprint_hulls
+                    helpers.footprint_hulls = None
+            if debug_exports:
+                export_file(shape=walls_shape, fname=path.join(r".", "things", r"debug_walls_shape"))
+            screw_outers = cached_stage(
+                "screw_insert_outers", wall_fields + screw_settings, lambda: screw_insert_outers(side=side), side,
+                with_cluster=True
+            )
+            return union([walls_shape, *screw_outers])
+
+        case_shells[side] = cached_stage("shell", wall_fields + screw_settings, shell_shape, side, with_cluster=True)
+        return case_shells[side]
+
     def model_side(side="right"):
         print('model_side()' + side)
-        shape = union([key_holes(side=side)])
-        if debug_exports:
-            export_file(shape=shape, fname=path.join(r".", "things", r"debug_key_plates"))
-        connector_shape = connectors()
-        shape = union([shape, connector_shape])
-        if debug_exports:
-            export_file(shape=shape, fname=path.join(r".", "things", r"debug_connector_shape"))
-        thumb_shape = cluster(side).thumb(side=side)
-        if debug_exports:
-            export_file(shape=thumb_shape, fname=path.join(r".", "things", r"debug_thumb_shape"))
-        shape = union([shape, thumb_shape])
-        thumb_connector_shape = cluster(side).thumb_connectors(side=side)
-        shape = union([shape, thumb_connector_shape])
+        key_fields = key_geometry_settings + plate_settings
+        thumb_fields = key_geometry_settings + plate_settings + thumb_settings
+
+        def top_shape():
+            key_shape = cached_stage(
+                "key_holes", key_fields, lambda: key_holes(side=side), side, with_parts=True
+            )
+            if debug_exports:
+                export_file(shape=key_shape, fname=path.join(r".", "things", r"debug_key_plates"))
+            connector_shape = cached_stage("connectors", key_geometry_settings, connectors, side)
+            if debug_exports:
+                export_file(shape=union([key_shape, connector_shape]), fname=path.join(r".", "things", r"debug_connector_shape"))
+            thumb_shape = cached_stage(
+                "thumb", thumb_fields, lambda: cluster(side).thumb(side=side), side, with_cluster=True, with_parts=True
+            )
+            if debug_exports:
+                export_file(shape=thumb_shape, fname=path.join(r".", "things", r"debug_thumb_shape"))
+            thumb_connector_shape = cached_stage(
+                "thumb_connectors", thumb_fields, lambda: cluster(side).thumb_connectors(side=side), side,
+                with_cluster=True
+            )
+            # one union of all the top pieces lets the union engine balance the fuses
+            return union([key_shape, connector_shape, thumb_shape, thumb_connector_shape])
+
+        # the unions are cached as well, they cost more than building the pieces
+        shape = cached_stage("top", thumb_fields, top_shape, side, with_cluster=True, with_parts=True)
         if debug_exports:
             export_file(shape=shape, fname=path.join(r".", "things", r"debug_thumb_connector_shape"))
-        walls_shape = case_walls(side=side)
-        if debug_exports:
-            export_file(shape=walls_shape, fname=path.join(r".", "things", r"debug_walls_shape"))
-        s2 = union([walls_shape])
-        s2 = union([s2, *screw_insert_outers(side=side)])
 
-        if controller_mount_type in ['RJ9_USB_TEENSY', 'USB_TEENSY']:
-            s2 = union([s2, teensy_holder()])
+        s2 = case_shell(side)
+
+        with tracer.stage("case_features_" + side) as record:
+            if controller_mount_type in ['RJ9_USB_TEENSY', 'USB_TEENSY']:
+                s2 = union([s2, teensy_holder()])
 
-        if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL', 'USB_WALL', 'USB_TEENSY']:
-            s2 = union([s2, usb_holder()])
-            s2 = difference(s2, [usb_holder_hole()])
+            if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL', 'USB_WALL', 'USB_TEENSY']:
+                s2 = union([s2, usb_holder()])
+                s2 = difference(s2, [usb_holder_hole()])
 
-        if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
-            s2 = difference(s2, [rj9_space()])
+            if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
+                s2 = difference(s2, [rj9_space()])
 
-        if controller_mount_type in ['BLACKPILL_EXTERNAL']:
-            s2 = difference(s2, [blackpill_mount_hole()])
+            if controller_mount_type in ['BLACKPILL_EXTERNAL']:
+                s2 = difference(s2, [blackpill_mount_hole()])
 
-        if controller_mount_type in ['EXTERNAL']:
-            s2 = difference(s2, [external_mount_hole()])
+            if controller_mount_type in ['EXTERNAL']:
+                s2 = difference(s2, [external_mount_hole()])
 
-        if controller_mount_type in ['None']:
-            0  # do nothing, only here to expressly state inaction.
+            if controller_mount_type in ['None']:
+                0  # do nothing, only here to expressly state inaction.
 
-        s2 = difference(s2, [union(screw_insert_holes(side=side))])
-        shape = union([shape, s2])
+            s2 = difference(s2, [union(screw_insert_holes(side=side))])
+            shape = union([shape, s2])
 
-        if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
-            shape = union([shape, rj9_holder()])
+            if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
+                shape = union([shape, rj9_holder()])
+            record["shape"] = shape
 
+        oled_fields = key_geometry_settings + oled_settings
         if oled_mount_type == "UNDERCUT":
-            hole, frame = oled_undercut_mount_frame(side=side)
+            hole, frame = cached_stage("oled", oled_fields, lambda: oled_undercut_mount_frame(side=side), side)
             shape = difference(shape, [hole])
             shape = union([shape, frame])
 
         elif oled_mount_type == "SLIDING":
-            hole, frame = oled_sliding_mount_frame(side=side)
+            hole, frame = cached_stage("oled", oled_fields, lambda: oled_sliding_mount_frame(side=side), side)
             shape = difference(shape, [hole])
             shape = union([shape, frame])
 
         elif oled_mount_type == "CLIP":
-            hole, frame = oled_clip_mount_frame(side=side)
+            hole, frame = cached_stage("oled", oled_fields, lambda: oled_clip_mount_frame(side=side), side)
             shape = difference(shape, [hole])
             shape = union([shape, frame])
 
         if not quickly:
-            if trackball_in_wall and (side == ball_side or ball_side == 'both'):
-                tbprecut, tb, tbcutout, sensor, ball = generate_trackball_in_wall()
-
-                shape = difference(shape, [tbprecut])
-                # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_1"))
-                shape = union([shape, tb])
-                # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_2"))
-                shape = difference(shape, [tbcutout])
-                # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_3a"))
-                # export_file(shape=add([shape, sensor]), fname=path.join(save_path, config_name + r"_test_3b"))
-                shape = union([shape, sensor])
-
-                if show_caps:
-                    shape = add([shape, ball])
-
-            if cluster(side).is_tb:
-                tbprecut, tb, tbcutout, sensor, ball = generate_trackball_in_cluster(cluster(side))
+            with tracer.stage("trackball_booleans_" + side) as record:
+                if trackball_in_wall and (side == ball_side or ball_side == 'both'):
+                    tbprecut, tb, tbcutout, sensor, ball = cached_stage(
+                        "trackball_in_wall", key_geometry_settings + trackball_settings + oled_settings,
+                        generate_trackball_in_wall, side,
+                        with_parts=True
+                    )
 
-                shape = difference(shape, [tbprecut])
-                if cluster(side).has_btus():
-                    shape = difference(shape, [tbcutout])
-                    shape = union([shape, tb])
-                else:
+                    shape = difference(shape, [tbprecut])
                     # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_1"))
                     shape = union([shape, tb])
                     # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_2"))
@@ -1869,8 +2024,31 @@ def make_dactyl():
                     # export_file(shape=add([shape, sensor]), fname=path.join(save_path, config_name + r"_test_3b"))
                     shape = union([shape, sensor])
 
-                if show_caps:
-                    shape = add([shape, ball])
+                    if show_caps:
+                        shape = add([shape, ball])
+
+                if cluster(side).is_tb:
+                    tbprecut, tb, tbcutout, sensor, ball = cached_stage(
+                        "trackball", thumb_fields + trackball_settings, lambda: generate_trackball_in_cluster(cluster(side)),
+                        side, with_cluster=True, with_parts=True
+                    )
+
+                    shape = difference(shape, [tbprecut])
+                    if cluster(side).has_btus():
+                        shape = difference(shape, [tbcutout])
+                        shape = union([shape, tb])
+                    else:
+                        # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_1"))
+                        shape = union([shape, tb])
+                        # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_2"))
+                        shape = difference(shape, [tbcutout])
+                        # export_file(shape=shape, fname=path.join(save_path, config_name + r"_test_3a"))
+                        # export_file(shape=add([shape, sensor]), fname=path.join(save_path, config_name + r"_test_3b"))
+                        shape = union([shape, sensor])
+
+                    if show_caps:
+                        shape = add([shape, ball])
+                record["shape"] = shape
 
         block = translate(box(500, 500, 40), (0, 0, -20))
         shape = difference(shape, [block])
@@ -1891,45 +2069,89 @@ def make_dactyl():
         rest = union([rest, translate(base, (0, 0, 5)), plate])
         return rest
 
+    def footprint_outline(side='right'):
+        # outline of the plate in 2D from the wall hull points and the analytic screw inserts,
+        # None when shapely is missing, the walls came from the stage cache or the outline is not a single rim
+        if not baseplate_footprint or side not in wall_footprints or not footprint.available():
+            return None
+        bottom_radius, top_radius, height = screw_insert_outer_size()
+        locations = screw_insert_locations(side)
+        circles = [footprint.insert_circle(x, y, z, bottom_radius, top_radius, height, 0.0001) for x, y, z in locations]
+        circles = [circle for circle in circles if circle is not None]
+        outline = footprint.wall_footprint(
+            wall_footprints[side], circles, [(x, y, screw_hole_diameter / 2.) for x, y, z in locations]
+        )
+        if outline is None:
+            print("BASEPLATE OUTLINE NOT FOUND IN 2D, CUTTING THE CASE")
+            return None
+        outline["circles"] = circles
+        return outline
+
+    def footprint_wire(ring, circles):
+        edges = []
+        for segment in footprint.ring_segments(ring, circles):
+            points = [cq.Vector(x, y, 0) for x, y in segment[1:]]
+            if segment[0] == "arc":
+                edges.append(cq.Edge.makeThreePointArc(*points))
+            else:
+                edges.append(cq.Edge.makeLine(*points))
+        return cq.Wire.assembleEdges(edges)
+
+    def baseplate_section_wires(shape, side='right'):
+        # outer, inner and screw hole wires of the case cut just above the floor
+        # tool = translate(screw_insert_screw_holes(side=side), [0, 0, -10])
+        tool = screw_insert_all_shapes(screw_hole_diameter / 2., screw_hole_diameter / 2., 350, side=side)
+        for item in tool:
+            item = translate(item, [0, 0, -10])
+            shape = difference(shape, [item])
+
+        shape = translate(shape, (0, 0, -0.0001))
+
+        square = cq.Workplane('XY').rect(1000, 1000)
+        for wire in square.wires().objects:
+            plane = cq.Workplane('XY').add(cq.Face.makeFromWires(wire))
+        shape = intersect(shape, plane)
+
+        outside = shape.vertices(cq.DirectionMinMaxSelector(cq.Vector(1, 0, 0), True)).objects[0]
+        sizes = []
+        max_val = 0
+        inner_index = 0
+        base_wires = shape.wires().objects
+        for i_wire, wire in enumerate(base_wires):
+            is_outside = False
+            for vert in wire.Vertices():
+                if vert.toTuple() == outside.toTuple():
+                    outer_wire = wire
+                    outer_index = i_wire
+                    is_outside = True
+                    sizes.append(0)
+            if not is_outside:
+                sizes.append(len(wire.Vertices()))
+            if sizes[-1] > max_val:
+                inner_index = i_wire
+                max_val = sizes[-1]
+        debugprint(sizes)
+        inner_wire = base_wires[inner_index]
+        return outer_wire, inner_wire, [base_wires[i] for i in range(len(base_wires)) if i not in [inner_index, outer_index]]
+
     # NEEDS TO BE SPECIAL FOR CADQUERY
     def baseplate(wedge_angle=None, side='right'):
         global logo_file
         if ENGINE == 'cadquery':
             # shape = mod_r
-            shape = union([case_walls(side=side), *screw_insert_outers(side=side)])
-            # tool = translate(screw_insert_screw_holes(side=side), [0, 0, -10])
-            tool = screw_insert_all_shapes(screw_hole_diameter / 2., screw_hole_diameter / 2., 350, side=side)
-            for item in tool:
-                item = translate(item, [0, 0, -10])
-                shape = difference(shape, [item])
-
-            shape = translate(shape, (0, 0, -0.0001))
-
-            square = cq.Workplane('XY').rect(1000, 1000)
-            for wire in square.wires().objects:
-                plane = cq.Workplane('XY').add(cq.Face.makeFromWires(wire))
-            shape = intersect(shape, plane)
-
-            outside = shape.vertices(cq.DirectionMinMaxSelector(cq.Vector(1, 0, 0), True)).objects[0]
-            sizes = []
-            max_val = 0
-            inner_index = 0
-            base_wires = shape.wires().objects
-            for i_wire, wire in enumerate(base_wires):
-                is_outside = False
-                for vert in wire.Vertices():
-                    if vert.toTuple() == outside.toTuple():
-                        outer_wire = wire
-                        outer_index = i_wire
-                        is_outside = True
-                        sizes.append(0)
-                if not is_outside:
-                    sizes.append(len(wire.Vertices()))
-                if sizes[-1] > max_val:
-                    inner_index = i_wire
-                    max_val = sizes[-1]
-            debugprint(sizes)
-            inner_wire = base_wires[inner_index]
+            shape = case_shell(side)
+            outline = footprint_outline(side)
+            if outline is not None:
+                outer_wire = footprint_wire(outline["outer"], outline["circles"])
+                inner_wire = footprint_wire(outline["inner"], outline["circles"])
+                holes = [footprint_wire(ring, outline["circles"]) for ring in outline["slots"]]
+                hole_centers = []
+                for x, y, radius in outline["holes"]:
+                    holes.append(cq.Wire.makeCircle(radius, cq.Vector(x, y, 0), cq.Vector(0, 0, 1)))
+                    hole_centers.append((x, y))
+            else:
+                outer_wire, inner_wire, holes = baseplate_section_wires(shape, side)
+                hole_centers = [(hole.Center().x, hole.Center().y) for hole in holes]
 
             # inner_plate = cq.Workplane('XY').add(cq.Face.makeFromWires(inner_wire))
             if wedge_angle is not None:
@@ -1939,7 +2161,7 @@ def make_dactyl():
                     cq.Solid.extrudeLinear(inner_wire, [], cq.Vector(0, 0, base_thickness)))
                 inner_shape = translate(inner_shape, (0, 0, -base_rim_thickness))
 
-                if logo_file not in ["", None]:
+                if logo_file not in ["", None] and not preview:
                     logo = import_file(logo_file)
                     if side == "left":
                         logo = mirror(logo, "YZ")
@@ -1948,21 +2170,16 @@ def make_dactyl():
 
                     inner_shape = union([inner_shape, logo])
 
-                holes = []
-                for i in range(len(base_wires)):
-                    if i not in [inner_index, outer_index]:
-                        holes.append(base_wires[i])
                 cutout = [*holes, inner_wire]
 
                 shape = cq.Workplane('XY').add(
                     cq.Solid.extrudeLinear(outer_wire, cutout, cq.Vector(0, 0, base_rim_thickness)))
                 hole_shapes = []
-                for hole in holes:
-                    loc = hole.Center()
+                for x, y in hole_centers:
                     hole_shapes.append(
                         translate(
                             cylinder(screw_cbore_diameter / 2.0, screw_cbore_depth),
-                            (loc.x, loc.y, 0)
+                            (x, y, 0)
                             # (loc.x, loc.y, screw_cbore_depth/2)
                         )
                     )
@@ -1971,13 +2188,47 @@ def make_dactyl():
                 shape = union([shape, inner_shape])
 
 
+            return shape
+        elif ENGINE == 'manifold':
+            shape = case_shell(side)
+            tool = screw_insert_all_shapes(screw_hole_diameter / 2., screw_hole_diameter / 2., 350, side=side)
+            shape = difference(shape, [translate(item, [0, 0, -10]) for item in tool])
+
+            # same outlines as the cadquery plate: the loop reaching furthest along +X is the outside of the walls,
+            # the largest of the others their inside, and what is left are the screw holes
+            loops = section_loops(shape, 0.0001)
+            outer_loop = max(loops, key=lambda loop: loop[:, 0].max())
+            loops = [loop for loop in loops if loop is not outer_loop]
+            inner_loop = max(loops, key=loop_area)
+            holes = [loop for loop in loops if loop is not inner_loop]
+
+            inner_shape = extrude_poly(polyline(inner_loop), height=base_thickness)
+            inner_shape = translate(inner_shape, (0, 0, -base_rim_thickness))
+
+            if logo_file not in ["", None] and not preview:
+                logo = import_file(logo_file)
+                if side == "left":
+                    logo = mirror(logo, "YZ")
+                logo = translate(logo, logo_offsets)
+                inner_shape = union([inner_shape, logo])
+
+            shape = extrude_poly(
+                polyline(outer_loop), [polyline(loop) for loop in [*holes, inner_loop]], height=base_rim_thickness
+            )
+            hole_shapes = []
+            for hole in holes:
+                loc = hole.mean(axis=0)
+                hole_shapes.append(
+                    translate(cylinder(screw_cbore_diameter / 2.0, screw_cbore_depth), (loc[0], loc[1], 0))
+                )
+            shape = difference(shape, hole_shapes)
+            shape = translate(shape, (0, 0, -base_rim_thickness))
+            shape = union([shape, inner_shape])
+
             return shape
         else:
 
-            shape = union([
-                case_walls(side=side),
-                *screw_insert_outers(side=side)
-            ])
+            shape = case_shell(side)
 
             tool = translate(union(screw_insert_screw_holes(side=side)), [0, 0, -10])
             base = box(1000, 1000, .01)
@@ -1989,48 +2240,69 @@ def make_dactyl():
             return sl.projection(cut=True)(shape)
 
 
-    def run():
-
-        mod_r = model_side(side="right")
-        export_file(shape=mod_r, fname=path.join(save_path, config_name + r"_right"))
+    def same_cluster(cluster1, cluster2):
+        if cluster1 is cluster2:
+            return True
+        if type(cluster1) is not type(cluster2):
+            return False
+        return cluster_settings(cluster1) == cluster_settings(cluster2)
+
+    def cluster_settings(clust):
+        # public, non method instance attributes, the caches and cached placements are left out
+        values = {name: value for name, value in vars(clust).items() if not name.startswith('_') and not callable(value)}
+        return json.dumps(values, sort_keys=True, default=str)
+
+    def mirror_left_side():
+        # the left half is the right half built again and mirrored, so it can be mirrored directly
+        # unless one of the side dependent options below differs between the sides.
+        if data.get("symmetry", cfg.shape_config["symmetry"]) == "asymmetric":
+            return False  # forced from the config
+        if symmetry == "asymmetric":
+            return False  # imported plate part or one sided trackball, see derived values
+        if plate_holes and plate_holes_xy_offset[0] != 0:
+            return False  # single_plate mirrors the left plate, off center holes change sides
+        if trackball_in_wall and ball_side != 'both':
+            return False
+        if ENGINE != 'solid' and logo_file not in ["", None] and not preview:
+            return False  # logo is mirrored back before the left plate is mirrored, so it reads the right way
+        return same_cluster(cluster("right"), cluster("left"))
+
+    def export_right_side():
+        mod_r = tracer.run("model_side_right", lambda: model_side(side="right"))
+        with tracer.stage("export_right"):
+            export_file(shape=mod_r, fname=path.join(save_path, config_name + r"_right"))
 
         if quickly:
             print(">>>>>  QUICK RENDER: Only rendering a the right side.")
-            exit(0)
+            return mod_r, None
 
-        base = baseplate(side='right')
-        export_file(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
-        export_dxf(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
+        base = tracer.run("baseplate_right", lambda: baseplate(side='right'))
+        with tracer.stage("export_right_plate"):
+            export_file(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
+            export_dxf(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
 
         # rest = wrist_rest(mod_r, base, side="right")
         #
         # export_file(shape=rest, fname=path.join(save_path, config_name + r"_right_wrist_rest"))
 
-        # if symmetry == "asymmetric":
-
-        mod_l = model_side(side="left")
-        export_file(shape=mod_l, fname=path.join(save_path, config_name + r"_left"))
+        return mod_r, base
 
-        base_l = mirror(baseplate(side='left'), 'YZ')
-        export_file(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
-        export_dxf(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
+    def export_left_side(right_side=None):
+        if right_side is not None:
+            print("LEFT SIDE MATCHES RIGHT SIDE, MIRRORING RIGHT SIDE")
+            mod_l = mirror(right_side[0], 'YZ')
+            base_l = mirror(right_side[1], 'YZ')
+        else:
+            mod_l = tracer.run("model_side_left", lambda: model_side(side="left"))
+            base_l = tracer.run("baseplate_left", lambda: mirror(baseplate(side='left'), 'YZ'))
 
-        # else:
-        #     export_file(shape=mirror(mod_r, 'YZ'), fname=path.join(save_path, config_name + r"_left"))
-        #
-        #     lbase = mirror(base, 'YZ')
-        #     export_file(shape=lbase, fname=path.join(save_path, config_name + r"_left_plate"))
-        #     export_dxf(shape=lbase, fname=path.join(save_path, config_name + r"_left_plate"))
-
-        if ENGINE == 'cadquery':
-            import freecad_that as freecad
-            freecad.generate_freecad_script(path.abspath(save_path), [
-                config_name + r"_right",
-                config_name + r"_left",
-                config_name + r"_right_plate",
-                config_name + r"_left_plate"
-            ], config_name)
+        with tracer.stage("export_left"):
+            export_file(shape=mod_l, fname=path.join(save_path, config_name + r"_left"))
+        with tracer.stage("export_left_plate"):
+            export_file(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
+            export_dxf(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
 
+    def export_oled_tests():
         if oled_mount_type == 'UNDERCUT':
             export_file(shape=oled_undercut_mount_frame()[1],
                         fname=path.join(save_path, config_name + r"_oled_undercut_test"))
@@ -2048,31 +2320,83 @@ def make_dactyl():
             export_file(shape=union((oled_clip_mount_frame()[1], oled_clip())),
                         fname=path.join(save_path, config_name + r"_oled_clip_assy_test"))
 
+    def trace_part(name):
+        return path.join(save_path, config_name + "_trace_" + name.replace(" ", "_") + ".part.json")
+
+    def traced_task(name, task):
+        # a forked worker traces its own stages and leaves them in a part file for the parent to merge
+        def run_task():
+            tracer.reset()
+            with tracer.stage(name):
+                task()
+            if tracer.enabled:
+                tracer.save_part(trace_part(name), save_path, config_name)
+        return run_task
+
+    def build_outputs(start_time, extension=None):
+        # files this build wrote, forked workers included: everything in save_path under its name changed since it started
+        return sorted(
+            path.abspath(path.join(save_path, item)) for item in os.listdir(save_path)
+            if item.startswith(config_name) and (extension is None or item.endswith(extension))
+            and path.isfile(path.join(save_path, item)) and path.getmtime(path.join(save_path, item)) >= start_time
+        )
+
+    def render_scad_files(start_time):
+        # every .scad this build wrote goes through one bounded pool of OpenSCAD renders
+        fnames = [fname[:-len(".scad")] for fname in build_outputs(start_time, ".scad")]
+        with tracer.stage("render_stl") as record:
+            timings = render_stls(fnames)
+            record["files"] = {path.basename(fname): seconds for fname, seconds in timings.items()}
+
+    def run():
+        start_time = time.time()
+        with tracer.stage("run"):
+            mirrored = mirror_left_side()
+            parallel = parallel_sides and not quickly and fork_available()
+
+            if parallel:
+                # forked workers start from this process's clusters and caches, each one exports its own files
+                if mirrored:
+                    tasks = [("right and left", lambda: export_left_side(export_right_side()))]
+                else:
+                    tasks = [("right", export_right_side), ("left", export_left_side)]
+                if not preview:
+                    tasks.append(("oled tests", export_oled_tests))
+                try:
+                    run_forked([(name, traced_task(name, task)) for name, task in tasks])
+                finally:
+                    for name, task in tasks:
+                        tracer.load_part(trace_part(name))
+            else:
+                right_side = export_right_side()
+                if not quickly:
+                    export_left_side(right_side if mirrored else None)
+
+            if ENGINE == 'cadquery' and not quickly:
+                import freecad_that as freecad
+                freecad.generate_freecad_script(path.abspath(save_path), [
+                    config_name + r"_right",
+                    config_name + r"_left",
+                    config_name + r"_right_plate",
+                    config_name + r"_left_plate"
+                ], config_name)
+
+            if not parallel and not preview and not quickly:
+                with tracer.stage("oled_tests"):
+                    export_oled_tests()
+
+            if ENGINE == 'solid' and scad_to_stl:
+                render_scad_files(start_time)
+
+        tracer.write(save_path, config_name)
+        return build_outputs(start_time)
+
     all_merged = locals().copy()
     for item in globals():
         all_merged[item] = globals()[item]
 
     def get_cluster(style):
-        if style == CarbonfetCluster.name():
-            clust = CarbonfetCluster(all_merged)
-        elif style == MiniCluster.name():
-            clust = MiniCluster(all_merged)
-        elif style == MinidoxCluster.name():
-            clust = MinidoxCluster(all_merged)
-        elif style == TrackballOrbyl.name():
-            clust = TrackballOrbyl(all_merged)
-        elif style == TrackballWild.name():
-            clust = TrackballWild(all_merged)
-        elif style == TrackballBTU.name():
-            clust = TrackballBTU(all_merged)
-        elif style == TrackballCJ.name():
-            clust = TrackballCJ(all_merged)
-        elif style == CustomCluster.name():
-            clust = CustomCluster(all_merged)
-        else:
-            clust = DefaultCluster(all_merged)
-
-        return clust
+        return cluster_class(style)(config, all_merged)
 
 
     right_cluster = get_cluster(thumb_style)
@@ -2090,7 +2414,8 @@ def make_dactyl():
     else:
         left_cluster = right_cluster  # this assumes thumb_style always overrides DEFAULT other_thumb
 
-    run()
+    # paths of the files written by the build
+    return run()
 
 
 #
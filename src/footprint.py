@@ -0,0 +1,123 @@
+import numpy as np
+
+try:
+    from shapely.geometry import MultiPoint, Point, Polygon
+    from shapely.ops import unary_union
+except ImportError:
+    MultiPoint = None  # no shapely, baseplates fall back to cutting the 3D case
+
+# 2D outline of the case where it meets the floor, built from the points of the wall hulls and the screw inserts
+# instead of cutting the 3D case with a plane.
+
+# facets per quarter circle while the outline is worked out, the arcs are put back as arcs in ring_segments
+circle_quad_segments = 16
+
+
+def available():
+    return MultiPoint is not None
+
+
+def hull_section(points, height):
+    # cut of the convex hull of points at z = height: the hull of the points on the plane and of the crossings of
+    # every segment joining a point above it to one below it
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    above = points[points[:, 2] >= height]
+    below = points[points[:, 2] < height]
+    if len(above) == 0 or len(below) == 0:
+        return None  # does not reach the cut
+    t = (above[:, None, 2] - height) / (above[:, None, 2] - below[None, :, 2])
+    crossings = above[:, None, :2] + t[:, :, None] * (below[None, :, :2] - above[:, None, :2])
+    section = MultiPoint(crossings.reshape(-1, 2)).convex_hull
+    if section.geom_type != 'Polygon':
+        return None
+    return section
+
+
+def insert_circle(x, y, z, bottom_radius, top_radius, insert_height, height):
+    # cut of an insert outer standing from z to z + insert_height, tapering from bottom_radius to top_radius
+    if not z <= height <= z + insert_height:
+        return None
+    return x, y, bottom_radius + (top_radius - bottom_radius) * (height - z) / insert_height
+
+
+def disc(x, y, radius):
+    return Point(x, y).buffer(radius, quad_segs=circle_quad_segments)
+
+
+def wall_footprint(hull_points, circles, holes, height=0.0001):
+    # hull_points: point arrays of the wall hulls, circles: (x, y, radius) of the insert outers at the cut,
+    # holes: (x, y, radius) of the screw holes.  Returns the outer ring, the inner ring, the other rings left in the
+    # rim and the holes, or None when the outline is not a single rim that holds every hole.
+    sections = [hull_section(points, height) for points in hull_points]
+    # hulls wholly above or below the cut leave nothing
+    sections = [item for item in sections if item is not None]
+    sections += [disc(*circle) for circle in circles]
+    if not sections:
+        return None
+
+    shape = unary_union(sections).simplify(1e-6)
+    if shape.geom_type != 'Polygon' or not shape.interiors:
+        return None
+
+    for x, y, radius in holes:
+        if not shape.contains(disc(x, y, radius)):
+            return None
+
+    rings = sorted(shape.interiors, key=lambda ring: Polygon(ring).area, reverse=True)
+
+    return {
+        "outer": np.array(shape.exterior.coords)[:-1],
+        "inner": np.array(rings[0].coords)[:-1],
+        "slots": [np.array(ring.coords)[:-1] for ring in rings[1:]],
+        "holes": list(holes),
+    }
+
+
+def ring_segments(ring, circles, tolerance=0.01):
+    # ("line", start, end) and ("arc", start, middle, end) pieces of a closed ring, runs of three or more points on
+    # one of the circles become a single arc with its ends moved onto the circle
+    on_circle = []
+    for point in ring:
+        index = -1
+        for i, (x, y, radius) in enumerate(circles):
+            if abs(np.hypot(point[0] - x, point[1] - y) - radius) < tolerance:
+                index = i
+                break
+        on_circle.append(index)
+
+    count = len(ring)
+    # start where a run begins, so no run is split over the end of the list
+    start = next((i for i in range(count) if on_circle[i] != on_circle[i - 1]), 0)
+    order = [(start + i) % count for i in range(count)]
+
+    runs = []
+    for i in order:
+        if runs and on_circle[i] != -1 and runs[-1][0] == on_circle[i]:
+            runs[-1][1].append(i)
+        else:
+            runs.append([on_circle[i], [i]])
+
+    points = [np.array(ring[i], dtype=float) for i in order]
+    position = {i: k for k, i in enumerate(order)}
+    arcs = []
+    for circle, members in runs:
+        if circle == -1 or len(members) < 3:
+            continue
+        x, y, radius = circles[circle]
+        for end in [members[0], members[-1]]:
+            offset = points[position[end]] - (x, y)
+            points[position[end]] = np.array((x, y)) + offset * radius / np.hypot(*offset)
+        arcs.append((position[members[0]], position[members[len(members) // 2]], position[members[-1]]))
+
+    segments = []
+    arc_starts = {first: (middle, last) for first, middle, last in arcs}
+    k = 0
+    while k < count:
+        if k in arc_starts:
+            middle, last = arc_starts[k]
+            segments.append(("arc", points[k], points[middle], points[last]))
+            k = last
+        else:
+            segments.append(("line", points[k], points[(k + 1) % count]))
+            k += 1
+    return segments
@@ -11,8 +11,48 @@ r2d = 180 / pi
 shape_config = {
 
     'ENGINE': 'solid',  # 'solid' = solid python / OpenSCAD, 'cadquery' = cadquery / OpenCascade
+    # 'ENGINE': 'manifold',  # 'manifold' = manifold3d triangle meshes, writes STL files directly
     # 'ENGINE': 'cadquery',  # 'solid' = solid python / OpenSCAD, 'cadquery' = cadquery / OpenCascade
 
+    # CADQUERY ONLY: how lists of shapes are unioned.  'tree' fuses pieces pairwise in a balanced tree,
+    # 'batch' fuses all pieces in one multi-argument fuse, 'fold' is the original one-at-a-time fold.
+    'union_engine': 'tree',
+    'union_check': False,  # compare each tree/batch union to the fold by volume and bounding box, slow.
+    'lazy_transforms': True,  # CADQUERY ONLY: compose rotate / translate calls and place each shape once
+    # CADQUERY ONLY: 'indexed' builds hulls from shared vertices and edges with one face per plane,
+    # 'sewn' sews one face per triangle and cleans the result (original behavior).
+    'hull_engine': 'indexed',
+    # CADQUERY ONLY: draw the baseplate outline in 2D (shapely) from the wall bottom points and the screw inserts
+    # instead of cutting the 3D case, the cut is still used when shapely is missing or the walls come from the stage cache.
+    'baseplate_footprint': True,
+
+    'cache_dir': '.cache',  # root directory for on-disk build caches
+    'import_cache': True,  # CADQUERY ONLY: keep native BRep copies of imported STEP parts in cache_dir
+    # reuse model_side stages (key holes, thumb, walls, ...) from cache_dir when the settings they read are unchanged.
+    # off by default, a stage only knows the settings listed for it in dactyl_manuform.py.
+    'stage_cache': False,
+    # build the two halves, their plates and the OLED test parts in parallel worker processes (needs fork, not on Windows).
+    'parallel_sides': False,
+    # write <config_name>_trace.json and a chrome://tracing file with the time, memory and shape size of each build stage.
+    'trace_build': False,
+    # with trace_build, also dump a cProfile file per stage into save_path/profiles, true or a list of stage name prefixes.
+    'trace_profile': False,
+    # SOLID ONLY: render every exported .scad file to STL with OpenSCAD once the build is done, several at a time.
+    'scad_to_stl': False,
+    'openscad_binary': None,  # None = OPENSCAD environment variable, then the PATH and the usual install places
+    'openscad_backend': 'auto',  # 'auto' = manifold when the OpenSCAD build has it, 'manifold' or 'cgal'
+    'openscad_workers': 0,  # concurrent renders, 0 = one per cpu
+    # SOLID ONLY: write subtrees used in more than one place (key plates, web posts, caps) once as .scad modules.
+    'scad_shared_modules': True,
+
+    # low fidelity build for tuning parameters: coarse facets and tessellation, imported parts replaced by boxes
+    # of their bounds (preview_proxies), no keyhole undercut chamfers, baseplate logo or OLED test parts.
+    'preview': False,
+    'preview_segments': 16,  # SOLID / MANIFOLD: cap on cylinder / sphere facets
+    'preview_tolerance': 0.5,  # CADQUERY ONLY: linear deflection of STL exports and tessellated hulls
+    'preview_angular_tolerance': 0.5,  # CADQUERY ONLY
+    'preview_proxies': True,
+
 
     ######################
     ## Shape parameters ##
@@ -25,6 +65,7 @@ shape_config = {
     "logo_file": None,
     'show_caps': True,
     'show_pcbs': False, #only runs if caps are shown, easist place to initially inject geometry
+    'resin': False,  # True skips the cluster's get_extras additions to the trackball socket
 
     'nrows':  5, #5,  # key rows
     'ncols':  6, #6,  # key columns
@@ -36,6 +77,7 @@ shape_config = {
     'tenting_angle':  pi / 12.0,  # or, change this for more precise tenting control
 
     # symmetry states if it is a symmetric or asymmetric bui.  If asymmetric it doubles the generation time.
+    # symmetric builds mirror the right side when no side dependent option differs, asymmetric always builds both.
     'symmetry':  "symmetric",  # "asymmetric" or "symmetric"
 
     'column_style_gt5':  "orthographic",
@@ -128,6 +170,8 @@ shape_config = {
     # Removed trackball_rotation, ball_z_offset. and trackball_sensor_rotation and added more flexibility.
     'tb_socket_translation_offset': (0, 0, 2.0),  # applied to the socket and sensor, large values will cause web/wall issues.
     'tb_socket_rotation_offset':    (0, 0, 0),  # applied to the socket and sensor, large values will cause web/wall issues.
+    'tb_btu_socket_translation_offset': (0, 0, -22.0),  # socket offsets used instead of the above for BTU clusters
+    'tb_btu_socket_rotation_offset':    (0, 0, 40),
     'tb_sensor_translation_offset': (0, 0, 0),  #deviation from socket offsets, for fixing generated geometry issues
     'tb_sensor_rotation_offset':    (0, 0, 0),  #deviation from socket offsets, for changing the sensor roll orientation
 
@@ -206,6 +250,7 @@ shape_config = {
 
     # Custom plate step file
     'plate_file':  None,
+    'plate_file_name': None,  # HS_ plates only, part in src/parts to use instead of hot_swap_plate
     'plate_offset':  0.0,
 
     ##########################
@@ -1,17 +1,62 @@
 import cadquery as cq
 from scipy.spatial import ConvexHull as sphull
 import numpy as np
+import hashlib
+import json
+import os
+from OCP.gp import gp_Trsf, gp_Pnt, gp_Dir, gp_Pln
+from OCP.BRep import BRep_Builder
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeVertex, BRepBuilderAPI_MakeEdge, BRepBuilderAPI_MakeWire, BRepBuilderAPI_MakeFace
+from OCP.BRepCheck import BRepCheck_Analyzer
+from OCP.TopoDS import TopoDS, TopoDS_Shell, TopoDS_Solid
+from transforms import rotation_matrix, translation_matrix, orthonormalize, transform_points, MatrixProbe
 
 
 debug_trace = False
 
+# boolean union strategy, overwritten from the union_engine / union_check config settings
+#   'fold' = fuse left to right into one growing solid (original behavior)
+#   'tree' = fuse pairwise in a balanced tree
+#   'batch' = one multi-argument fuse of every piece
+union_engine = 'tree'
+union_check = False
+
+# rotate / translate compose a 4x4 matrix on a LazyShape instead of copying the BRep on every call,
+# overwritten from the lazy_transforms config setting
+lazy_transforms = True
+
+# convex hull construction, overwritten from the hull_engine config setting
+#   'indexed' = shared vertices / edges, coplanar triangles merged into one polygon face per plane
+#   'sewn' = one face per triangle, sewn into a shell and cleaned (original behavior)
+hull_engine = 'indexed'
+
+# imported STEP parts, shared by every build in this process and keyed by file path and modification time
+imported_parts = {}
+# directory for native BRep copies of imported STEP files, set from the cache_dir / import_cache config settings
+import_cache_dir = None
+
+# preview fidelity, overwritten from the preview settings.  None / False keep the full fidelity.
+tess_tolerance = None  # linear deflection of STL exports and tess_hull
+tess_angular_tolerance = None
+proxy_imports = False  # imported STEP parts are replaced by boxes of their bounds
+part_bounds = {}
+
+# points of every hull built while the walls are made, the baseplate outline is drawn in 2D from their cut with the
+# floor.  None = not collecting
+footprint_hulls = None
+
 def debugprint(info):
     if debug_trace:
         print(info)
 
 
 def box(width, height, depth):
-    return cq.Workplane("XY").box(width, height, depth)
+    shape = cq.Workplane("XY").box(width, height, depth)
+    # corners are known, hulls of placed boxes (web posts) read them instead of walking the BRep
+    shape.hull_points = np.array([
+        (x * width / 2, y * height / 2, z * depth / 2) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)
+    ])
+    return shape
 
 
 def cylinder(radius, height, segments=100):
@@ -29,7 +74,93 @@ def cone(r1, r2, height):
         cq.Solid.makeCone(radius1=r1, radius2=r2, height=height))
 
 
+class LazyShape(object):
+    # a workplane with its pending rotate / translate calls composed into one matrix.  the real shape is placed
+    # with a single gp_Trsf location the first time a boolean, export or workplane method needs it.
+    def __init__(self, shape, matrix, points=None):
+        self.shape = shape
+        self.matrix = matrix
+        self.points = points
+        self.placed = None
+
+    def materialize(self):
+        if self.placed is None:
+            self.placed = place_shape(self.shape, self.matrix)
+        return self.placed
+
+    def __getattr__(self, name):
+        if name in ['shape', 'matrix', 'points', 'placed']:
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+
+def materialize(shape):
+    if isinstance(shape, LazyShape):
+        return shape.materialize()
+    return shape
+
+
+def local_points(shape):
+    # analytic points a shape was built from, in the frame of its unplaced workplane
+    if isinstance(shape, LazyShape):
+        return shape.points
+    return getattr(shape, 'hull_points', None)
+
+
+def shape_points(shape):
+    # known hull points of a shape in place, or None if they have to be read from the BRep
+    if isinstance(shape, LazyShape):
+        if shape.points is None:
+            return None
+        return transform_points(orthonormalize(shape.matrix), shape.points)
+    return getattr(shape, 'hull_points', None)
+
+
+def shape_vertices(shape):
+    points = shape_points(shape)
+    if points is not None:
+        return points
+    return np.array([vert.toTuple() for vert in materialize(shape).vertices().objects]).reshape(-1, 3)
+
+
+def matrix_trsf(matrix):
+    matrix = orthonormalize(matrix)
+    trsf = gp_Trsf()
+    trsf.SetValues(*[float(value) for value in matrix[:3].ravel()])
+    return trsf
+
+
+def place_shape(shape, matrix):
+    # moved() only sets the location, the BRep itself is shared rather than copied
+    location = cq.Location(matrix_trsf(matrix))
+    placed = shape.newObject([obj.moved(location) for obj in shape.objects])
+    points = local_points(shape)
+    if points is not None:
+        placed.hull_points = transform_points(orthonormalize(matrix), points)
+    return placed
+
+
+def can_defer(shape):
+    if isinstance(shape, LazyShape):
+        return True
+    return isinstance(shape, cq.Workplane) and all(isinstance(obj, cq.Shape) for obj in shape.objects)
+
+
+def transform(shape, matrix):
+    if isinstance(shape, MatrixProbe):
+        return MatrixProbe(matrix @ shape.matrix)
+    if isinstance(shape, LazyShape):
+        return LazyShape(shape.shape, matrix @ shape.matrix, shape.points)
+    if lazy_transforms and can_defer(shape):
+        return LazyShape(shape, np.array(matrix, dtype=float), local_points(shape))
+    return place_shape(shape, matrix)
+
+
 def rotate(shape, angle):
+    if isinstance(shape, MatrixProbe) or (lazy_transforms and can_defer(shape)):
+        return transform(shape, rotation_matrix(angle))
+
+    shape = materialize(shape)
     origin = (0, 0, 0)
     shape = shape.rotate(axisStartPoint=origin, axisEndPoint=(1, 0, 0), angleDegrees=angle[0])
     shape = shape.rotate(axisStartPoint=origin, axisEndPoint=(0, 1, 0), angleDegrees=angle[1])
@@ -38,16 +169,40 @@ def rotate(shape, angle):
 
 
 def translate(shape, vector):
-    return shape.translate(tuple(vector))
+    if isinstance(shape, MatrixProbe) or (lazy_transforms and can_defer(shape)):
+        return transform(shape, translation_matrix(vector))
+
+    return materialize(shape).translate(tuple(vector))
 
 
 def mirror(shape, plane=None):
     debugprint('mirror()')
-    return shape.mirror(mirrorPlane=plane)
+    return materialize(shape).mirror(mirrorPlane=plane)
 
 
 def union(shapes):
     debugprint('union()')
+    shapes = [materialize(item) for item in shapes]
+    if union_engine == 'fold':
+        return union_fold(shapes)
+
+    items = union_items(shapes)
+    if len(items) < 2:
+        return union_fold(shapes)
+
+    if union_engine == 'batch':
+        shape = union_batch(items)
+    else:
+        shape = union_tree(items)
+
+    if union_check:
+        shape = union_checked(shapes, shape)
+
+    return shape
+
+
+def union_fold(shapes):
+    # original left to right fold, every fuse re-processes the whole accumulated solid
     shape = None
     for item in shapes:
         if shape is None:
@@ -57,12 +212,74 @@ def union(shapes):
     return shape
 
 
+def union_shape(item):
+    if isinstance(item, cq.Shape):
+        return item
+    solids = [obj for obj in item.vals() if isinstance(obj, cq.Shape)]
+    if len(solids) == 1:
+        return solids[0]
+    return cq.Compound.makeCompound(solids)
+
+
+def union_items(shapes):
+    # drop the None / empty workplane placeholders the fold silently skipped over
+    items = []
+    for item in shapes:
+        if item is None:
+            continue
+        if isinstance(item, cq.Workplane) and len(item.vals()) == 0:
+            continue
+        items.append(union_shape(item))
+    return items
+
+
+def union_tree(items):
+    # fuse neighbours pairwise so every solid takes part in log2(n) fuses of similar size
+    while len(items) > 1:
+        merged = []
+        for i in range(0, len(items) - 1, 2):
+            merged.append(items[i].fuse(items[i + 1]).clean())
+        if len(items) % 2 == 1:
+            merged.append(items[-1])
+        items = merged
+    return cq.Workplane('XY').add(items[0])
+
+
+def union_batch(items):
+    # one multi-argument OpenCascade fuse
+    return cq.Workplane('XY').add(items[0].fuse(*items[1:]).clean())
+
+
+def union_checked(shapes, shape, tolerance=1e-4, box_tolerance=1e-2):
+    reference = union_shape(union_fold(shapes))
+    result = union_shape(shape)
+
+    ref_volume = reference.Volume()
+    volume_error = abs(ref_volume - result.Volume())
+    ok = volume_error <= tolerance * max(abs(ref_volume), 1.0)
+
+    ref_box = reference.BoundingBox()
+    result_box = result.BoundingBox()
+    for attr in ('xmin', 'xmax', 'ymin', 'ymax', 'zmin', 'zmax'):
+        if abs(getattr(ref_box, attr) - getattr(result_box, attr)) > box_tolerance:
+            ok = False
+
+    if not ok:
+        print("UNION CHECK FAILED: '{}' engine differs from fold (volume error {:.6f}), using fold result".format(
+            union_engine, volume_error))
+        return cq.Workplane('XY').add(reference)
+
+    return shape
+
+
 def add(shapes):
     debugprint('union()')
     shape = None
-    for item in shapes:
+    for item in [materialize(item) for item in shapes]:
         if shape is None:
-            shape = item
+            # Workplane.add extends its own object list, work on a new workplane so the first shape, possibly the
+            # cached placement of a LazyShape, and its hull points stay as they are
+            shape = item.newObject(list(item.objects))
         else:
             shape = shape.add(item)
     return shape
@@ -70,13 +287,14 @@ def add(shapes):
 
 def difference(shape, shapes):
     debugprint('difference()')
+    shape = materialize(shape)
     for item in shapes:
-        shape = shape.cut(item)
+        shape = shape.cut(materialize(item))
     return shape
 
 
 def intersect(shape1, shape2):
-    return shape1.intersect(shape2)
+    return materialize(shape1).intersect(materialize(shape2))
 
 
 def face_from_points(points):
@@ -100,6 +318,14 @@ def face_from_points(points):
 
 def hull_from_points(points):
     # debugprint('hull_from_points()')
+    if hull_engine == 'indexed':
+        shape = hull_from_points_indexed(points)
+        if shape is not None:
+            return shape
+    return hull_from_points_sewn(points)
+
+
+def hull_from_points_sewn(points):
     hull_calc = sphull(points)
     n_faces = len(hull_calc.simplices)
 
@@ -116,17 +342,101 @@ def hull_from_points(points):
     return shape
 
 
+def hull_polygons(points, hull_calc, decimals=7):
+    # groups the hull triangles by plane and walks the outline of each group, returns (normal, vertex loop)
+    # pairs, or None if a group does not form a single loop and the sewn hull has to be used instead
+    planes = {}
+    for simplex, equation in zip(hull_calc.simplices, hull_calc.equations):
+        key = tuple(np.round(equation, decimals))
+        planes.setdefault(key, (equation[:3], []))[1].append(simplex)
+
+    polygons = []
+    for normal, simplices in planes.values():
+        edges = set()
+        for a, b, c in simplices:
+            # qhull does not orient the simplices, wind them counter-clockwise seen from outside
+            if np.dot(np.cross(points[b] - points[a], points[c] - points[a]), normal) < 0:
+                b, c = c, b
+            edges.update([(a, b), (b, c), (c, a)])
+
+        # inner edges show up in both directions, the outline only once
+        outline = {}
+        for a, b in edges:
+            if (b, a) not in edges:
+                if a in outline:
+                    return None
+                outline[a] = b
+
+        loop = [next(iter(outline))]
+        while outline[loop[-1]] != loop[0]:
+            loop.append(outline[loop[-1]])
+            if len(loop) > len(outline):
+                return None
+        if len(loop) != len(outline):
+            return None
+        polygons.append((normal, loop))
+
+    return polygons
+
+
+def hull_from_points_indexed(points):
+    points = np.array(points, dtype=float)
+    hull_calc = sphull(points)
+    polygons = hull_polygons(points, hull_calc)
+    if polygons is None:
+        return None
+
+    try:
+        vertices = {}
+        edges = {}
+
+        def vertex(i):
+            if i not in vertices:
+                vertices[i] = BRepBuilderAPI_MakeVertex(gp_Pnt(*points[i])).Vertex()
+            return vertices[i]
+
+        def edge(a, b):
+            # each edge is built once and shared, reversed, by the face on its other side
+            key = (min(a, b), max(a, b))
+            if key not in edges:
+                edges[key] = BRepBuilderAPI_MakeEdge(vertex(key[0]), vertex(key[1])).Edge()
+            if key == (a, b):
+                return edges[key]
+            return TopoDS.Edge_s(edges[key].Reversed())
+
+        builder = BRep_Builder()
+        shell = TopoDS_Shell()
+        builder.MakeShell(shell)
+        for normal, loop in polygons:
+            wire = BRepBuilderAPI_MakeWire()
+            for i in range(len(loop)):
+                wire.Add(edge(loop[i], loop[(i + 1) % len(loop)]))
+            plane = gp_Pln(gp_Pnt(*points[loop[0]]), gp_Dir(*normal))
+            builder.Add(shell, BRepBuilderAPI_MakeFace(plane, wire.Wire(), True).Face())
+        shell.Closed(True)
+
+        solid = TopoDS_Solid()
+        builder.MakeSolid(solid)
+        builder.Add(solid, shell)
+        if not BRepCheck_Analyzer(solid).IsValid():
+            print("INDEXED HULL INVALID, SEWING FACES")
+            return None
+    except Exception as err:
+        print("INDEXED HULL FAILED, SEWING FACES ({})".format(err))
+        return None
+
+    return cq.Workplane('XY').add(cq.Solid(solid))
+
+
 def hull_from_shapes(shapes, points=None):
     # debugprint('hull_from_shapes()')
-    vertices = []
-    for shape in shapes:
-        verts = shape.vertices()
-        for vert in verts.objects:
-            vertices.append(np.array(vert.toTuple()))
+    vertices = [shape_vertices(shape) for shape in shapes]
     if points is not None:
-        for point in points:
-            vertices.append(np.array(point))
+        vertices.append(np.array(points, dtype=float).reshape(-1, 3))
 
+    vertices = np.vstack(vertices)
+    if footprint_hulls is not None:
+        footprint_hulls.append(vertices)
     shape = hull_from_points(vertices)
     return shape
 
@@ -136,9 +446,14 @@ def tess_hull(shapes, sl_tol=.5, sl_angTol=1):
     vertices = []
     solids = []
     for wp in shapes:
-        for item in wp.solids().objects:
+        for item in materialize(wp).solids().objects:
             solids.append(item)
 
+    if tess_tolerance is not None:
+        sl_tol = max(sl_tol, tess_tolerance)
+    if tess_angular_tolerance is not None:
+        sl_angTol = max(sl_angTol, tess_angular_tolerance)
+
     for shape in solids:
         verts = shape.tessellate(sl_tol, sl_angTol)[0]
         for vert in verts:
@@ -166,9 +481,7 @@ def bottom_hull(p, height=0.001):
     for item in p:
         vertices = []
         # verts = item.faces('<Z').vertices()
-        verts = item.faces().vertices()
-        for vert in verts.objects:
-            v0 = vert.toTuple()
+        for v0 in shape_vertices(item):
             v1 = [v0[0], v0[1], -10]
             vertices.append(np.array(v0))
             vertices.append(np.array(v1))
@@ -180,11 +493,6 @@ def bottom_hull(p, height=0.001):
         if shape is None:
             shape = t_shape
 
-        for shp in (*p, shape, t_shape):
-            try:
-                shp.vertices()
-            except:
-                0
         shape = union([shape, hull_from_shapes((shape, t_shape))])
 
     return shape
@@ -212,18 +520,107 @@ def extrude_poly(outer_poly, inner_polys=None, height=1):  # vector=(0,0,1)):
 
 
 def import_file(fname, convexity=None):
-    print("IMPORTING FROM {}".format(fname))
-    return cq.Workplane('XY').add(cq.importers.importShape(
-        cq.exporters.ExportTypes.STEP,
-        fname + ".step"))
+    full_name = fname + ".step"
+    key = (os.path.abspath(full_name), os.path.getmtime(full_name))
+    if proxy_imports:
+        return import_proxy(full_name, key)
+    if key not in imported_parts:
+        imported_parts[key] = load_step(full_name, key)
+    return cq.Workplane('XY').add(imported_parts[key])
+
+
+def import_cache_file(full_name, key, extension):
+    if import_cache_dir in ['', None]:
+        return None
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(full_name))[0]
+    return os.path.join(import_cache_dir, name + "_" + digest + extension)
+
+
+def import_proxy(full_name, key):
+    # preview stand in for an imported part, a box over its bounds.  the bounds are kept next to the BRep
+    # copies so a preview does not need to load the part at all once they are known.
+    if key not in part_bounds:
+        bounds_file = import_cache_file(full_name, key, ".bounds.json")
+        if bounds_file is not None and os.path.exists(bounds_file):
+            with open(bounds_file, mode='r') as fid:
+                part_bounds[key] = json.load(fid)
+        else:
+            if key not in imported_parts:
+                imported_parts[key] = load_step(full_name, key)
+            bound_box = cq.Compound.makeCompound(imported_parts[key]).BoundingBox()
+            part_bounds[key] = [
+                bound_box.xmin, bound_box.ymin, bound_box.zmin, bound_box.xmax, bound_box.ymax, bound_box.zmax
+            ]
+            if bounds_file is not None:
+                os.makedirs(import_cache_dir, exist_ok=True)
+                with open(bounds_file, mode='w') as fid:
+                    json.dump(part_bounds[key], fid)
+
+    xmin, ymin, zmin, xmax, ymax, zmax = part_bounds[key]
+    print("IMPORTING PROXY FOR {}".format(full_name))
+    shape = box(xmax - xmin, ymax - ymin, zmax - zmin)
+    return translate(shape, ((xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2))
+
+
+def load_step(full_name, key):
+    brep_file = import_cache_file(full_name, key, ".brep")
+    if brep_file is not None:
+        if os.path.exists(brep_file):
+            print("IMPORTING FROM {}".format(brep_file))
+            return [cq.Shape.importBrep(brep_file)]
+
+    print("IMPORTING FROM {}".format(full_name))
+    shapes = cq.importers.importShape(cq.exporters.ExportTypes.STEP, full_name).vals()
+
+    if brep_file is not None:
+        os.makedirs(import_cache_dir, exist_ok=True)
+        shape = shapes[0] if len(shapes) == 1 else cq.Compound.makeCompound(shapes)
+        # written aside and renamed, parallel builds may be reading the same cache file
+        temp_file = brep_file + "." + str(os.getpid()) + ".tmp"
+        shape.exportBrep(temp_file)
+        os.replace(temp_file, brep_file)
+
+    return shapes
+
+def save_shape(shape, fname):
+    # native BRep copy of a built stage for the stage cache, loads far faster than STEP
+    union_shape(materialize(shape)).exportBrep(fname + ".brep")
+
+
+def load_shape(fname):
+    shape = cq.Shape.importBrep(fname + ".brep")
+    if isinstance(shape, cq.Compound) and len(list(shape)) == 0:
+        # stage built nothing, hand back the empty workplane it started as
+        return cq.Workplane('XY')
+    return cq.Workplane('XY').add(shape)
+
+
+def shape_counts(shape):
+    # size of a stage's result for the build trace, stages can return tuples of shapes
+    counts = {"solids": 0, "faces": 0}
+    for item in (shape if isinstance(shape, (tuple, list)) else [shape]):
+        item = materialize(item)
+        if not isinstance(item, cq.Workplane):
+            continue
+        for obj in item.objects:
+            if isinstance(obj, cq.Shape):
+                counts["solids"] += len(obj.Solids())
+                counts["faces"] += len(obj.Faces())
+    return counts
+
 
 def export_stl(shape, fname):
     print("EXPORTING STL TO {}".format(fname))
-    cq.exporters.export(shape, fname=fname + "_cadquery.stl", exportType="STL")
+    if tess_tolerance is None:
+        cq.exporters.export(materialize(shape), fname=fname + "_cadquery.stl", exportType="STL")
+    else:
+        cq.exporters.export(materialize(shape), fname=fname + "_cadquery.stl", exportType="STL",
+                            tolerance=tess_tolerance, angularTolerance=tess_angular_tolerance or 0.1)
 
 def export_file(shape, fname):
     print("EXPORTING TO {}".format(fname))
-    cq.exporters.export(w=shape, fname=fname + ".step",
+    cq.exporters.export(w=materialize(shape), fname=fname + ".step",
                         exportType='STEP')
 
     export_stl(shape, fname)
@@ -231,5 +628,5 @@ def export_file(shape, fname):
 
 def export_dxf(shape, fname):
     print("EXPORTING TO {}".format(fname))
-    cq.exporters.export(w=shape, fname=fname + ".dxf",
+    cq.exporters.export(w=materialize(shape), fname=fname + ".dxf",
                         exportType='DXF')
@@ -0,0 +1,251 @@
+import os
+import numpy as np
+import manifold3d as mf
+from transforms import rotation_matrix, translation_matrix, MatrixProbe
+from stl_files import read_stl, write_stl, stl_bounds
+
+# triangle mesh engine on manifold3d, booleans and hulls run in process and the exports are written as STL
+# directly, no OpenSCAD or OpenCascade involved.
+
+debug_trace = False
+
+# facets of a full circle, cylinders take theirs from the segments argument like the solid engine
+circle_segments = 64
+
+# preview fidelity, overwritten from the preview settings.  None / False keep the full fidelity.
+max_segments = None  # cap on cylinder and sphere facets
+proxy_imports = False  # imported STL parts are replaced by boxes of their bounds
+part_bounds = {}
+
+# imported STL parts, shared by every build in this process and keyed by file path and modification time
+imported_meshes = {}
+
+
+def debugprint(info):
+    if debug_trace:
+        print(info)
+
+
+def segment_count(segments):
+    if max_segments is not None:
+        return min(segments, max_segments)
+    return segments
+
+
+def box(width, height, depth):
+    return mf.Manifold.cube((width, height, depth), center=True)
+
+
+def cylinder(radius, height, segments=100):
+    return mf.Manifold.cylinder(height, radius, circular_segments=segment_count(segments), center=True)
+
+
+def sphere(radius):
+    return mf.Manifold.sphere(radius, circular_segments=segment_count(circle_segments))
+
+
+def cone(r1, r2, height):
+    return mf.Manifold.cylinder(height, r1, r2, circular_segments=segment_count(circle_segments))
+
+
+def rotate(shape, angle):
+    return transform(shape, rotation_matrix(angle))
+
+
+def translate(shape, vector):
+    return transform(shape, translation_matrix(vector))
+
+
+def transform(shape, matrix):
+    if isinstance(shape, MatrixProbe):
+        return MatrixProbe(matrix @ shape.matrix)
+    # manifold composes transforms lazily and applies them once before the next boolean
+    return shape.transform(np.asarray(matrix, dtype=float)[:3, :4])
+
+
+def mirror(shape, plane=None):
+    debugprint('mirror()')
+    planes = {
+        'XY': [0, 0, 1],
+        'YX': [0, 0, -1],
+        'XZ': [0, 1, 0],
+        'ZX': [0, -1, 0],
+        'YZ': [1, 0, 0],
+        'ZY': [-1, 0, 0],
+    }
+    return shape.mirror(planes[plane])
+
+
+def union(shapes):
+    debugprint('union()')
+    shapes = [item for item in shapes if item is not None]
+    if not shapes:
+        return None
+    return mf.Manifold.batch_boolean(shapes, mf.OpType.Add)
+
+
+def add(shapes):
+    return union(shapes)
+
+
+def difference(shape, shapes):
+    debugprint('difference()')
+    shapes = [item for item in shapes if item is not None]
+    if not shapes:
+        return shape
+    return mf.Manifold.batch_boolean([shape, *shapes], mf.OpType.Subtract)
+
+
+def intersect(shape1, shape2):
+    return shape1 ^ shape2
+
+
+def mesh_points(shape):
+    return np.asarray(shape.to_mesh().vert_properties)[:, :3].astype(float)
+
+
+def hull_from_points(points):
+    return mf.Manifold.hull_points(np.asarray(points, dtype=float).reshape(-1, 3))
+
+
+def hull_from_shapes(shapes, points=None):
+    # debugprint('hull_from_shapes()')
+    if points is None:
+        return mf.Manifold.batch_hull(list(shapes))
+    vertices = [mesh_points(shape) for shape in shapes]
+    vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+    return hull_from_points(np.vstack(vertices))
+
+
+def tess_hull(shapes, sl_tol=.5, sl_angTol=1):
+    return hull_from_shapes(shapes)
+
+
+def triangle_hulls(shapes):
+    debugprint('triangle_hulls()')
+    hulls = []
+    for i in range(len(shapes) - 2):
+        hulls.append(hull_from_shapes(shapes[i: (i + 3)]))
+
+    return union(hulls)
+
+
+def bottom_hull(p, height=0.001):
+    debugprint("bottom_hull()")
+    # hull of the shapes and their footprint dropped to z = -10, what the other engines build piece by piece
+    vertices = np.vstack([mesh_points(item) for item in p])
+    dropped = np.array(vertices)
+    dropped[:, 2] = -10
+    return hull_from_points(np.vstack([vertices, dropped]))
+
+
+def polyline(point_list):
+    points = [tuple(point[:2]) for point in point_list]
+    if len(points) > 1 and points[0] == points[-1]:
+        points = points[:-1]
+    # even-odd so the outline is filled whichever way round its points run
+    return mf.CrossSection([points], mf.FillRule.EvenOdd)
+
+
+def extrude_poly(outer_poly, inner_polys=None, height=1):
+    section = outer_poly
+    if inner_polys is not None:
+        for item in inner_polys:
+            section = section - item
+    return mf.Manifold.extrude(section, height)
+
+
+def section_loops(shape, height=0.):
+    # closed outlines of the shape cut at z = height, one (n, 2) array per loop
+    # near duplicate points, where the cut passes close to a vertex, are merged
+    return [np.asarray(loop, dtype=float) for loop in shape.slice(height).simplify(1e-4).to_polygons()]
+
+
+def loop_area(loop):
+    x, y = loop[:, 0], loop[:, 1]
+    return abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.
+
+
+def mesh_from_triangles(triangles):
+    # STL triangles carry their own corners, equal corners are merged into shared vertices
+    vertices, inverse = np.unique(triangles.reshape(-1, 3), axis=0, return_inverse=True)
+    faces = inverse.reshape(-1, 3).astype(np.uint32)
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+    mesh = mf.Mesh(vert_properties=vertices.astype(np.float32), tri_verts=faces)
+    mesh.merge()
+    return mesh
+
+
+def import_file(fname, convexity=None):
+    full_name = fname + r".stl"
+    key = (os.path.abspath(full_name), os.path.getmtime(full_name))
+    if proxy_imports:
+        return import_proxy(full_name, key)
+
+    if key not in imported_meshes:
+        print("IMPORTING FROM {}".format(full_name))
+        shape = mf.Manifold(mesh_from_triangles(read_stl(full_name)))
+        if shape.status() != mf.Error.NoError:
+            raise ValueError("{} is not a closed manifold mesh ({})".format(full_name, shape.status()))
+        imported_meshes[key] = shape
+    return imported_meshes[key]
+
+
+def import_proxy(full_name, key):
+    # preview stand in for an imported part, a box over its bounds
+    if key not in part_bounds:
+        part_bounds[key] = stl_bounds(full_name)
+    xmin, ymin, zmin, xmax, ymax, zmax = part_bounds[key]
+    print("IMPORTING PROXY FOR {}".format(full_name))
+    shape = box(xmax - xmin, ymax - ymin, zmax - zmin)
+    return translate(shape, ((xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2))
+
+
+def save_shape(shape, fname):
+    # double precision indexed mesh of a built stage for the stage cache, it loads back with the same topology
+    mesh = shape.to_mesh64()
+    np.savez(fname + ".npz", vertices=np.asarray(mesh.vert_properties)[:, :3], triangles=np.asarray(mesh.tri_verts))
+
+
+def load_shape(fname):
+    data = np.load(fname + ".npz")
+    return mf.Manifold(mf.Mesh64(
+        vert_properties=np.ascontiguousarray(data["vertices"], dtype=np.float64),
+        tri_verts=np.ascontiguousarray(data["triangles"], dtype=np.uint64),
+    ))
+
+
+def shape_counts(shape):
+    # size of a stage's result for the build trace, stages can return tuples of shapes
+    counts = {"triangles": 0, "vertices": 0}
+    for item in (shape if isinstance(shape, (tuple, list)) else [shape]):
+        if isinstance(item, mf.Manifold):
+            counts["triangles"] += item.num_tri()
+            counts["vertices"] += item.num_vert()
+    return counts
+
+
+def export_file(shape, fname):
+    print("EXPORTING TO {}".format(fname))
+    export_stl(shape, fname)
+
+
+def export_stl(shape, fname):
+    print("EXPORTING STL TO {}".format(fname))
+    mesh = shape.to_mesh()
+    write_stl(fname + "_manifold.stl", np.asarray(mesh.vert_properties)[:, :3], np.asarray(mesh.tri_verts))
+
+
+def export_dxf(shape, fname):
+    # outline of the plate where it meets the ground, as closed R12 polylines
+    print("EXPORTING TO {}".format(fname))
+    bounds = shape.bounding_box()
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    for loop in section_loops(shape, bounds[2] + 1e-3):
+        lines += ["0", "POLYLINE", "8", "0", "66", "1", "70", "1"]
+        for x, y in loop:
+            lines += ["0", "VERTEX", "8", "0", "10", repr(float(x)), "20", repr(float(y)), "30", "0.0"]
+        lines += ["0", "SEQEND"]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    with open(fname + ".dxf", mode='w') as fid:
+        fid.write("\n".join(lines) + "\n")
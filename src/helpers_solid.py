@@ -1,8 +1,37 @@
 import solid as sl
-from subprocess import run
+import os
+import time
+import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from transforms import rotation_matrix, translation_matrix, MatrixProbe
+from stl_files import stl_bounds
+from subprocess import run, PIPE, STDOUT
 
 debug_trace = False
 
+# preview fidelity, overwritten from the preview settings.  None / False keep the full fidelity.
+max_segments = None  # cap on cylinder and sphere facets, also the $fn of the exported file
+proxy_imports = False  # imported STL parts are replaced by boxes of their bounds
+part_bounds = {}
+
+# OpenSCAD renders of the exported .scad files, overwritten from the render settings
+openscad_path = None  # None = search the OPENSCAD environment variable, the PATH and the usual install places
+render_backend = 'auto'  # 'auto' = manifold when the OpenSCAD build has it, 'manifold' or 'cgal'
+render_workers = 0  # concurrent renders, 0 = one per cpu
+scad_modules = True  # repeated subtrees are written once as modules, False = solidpython's plain render
+
+openscad_locations = [
+    "C:\\Program Files\\OpenSCAD\\openscad.com",
+    "C:\\Program Files\\OpenSCAD (Nightly)\\openscad.com",
+    "/Applications/OpenSCAD.app/Contents/MacOS/OpenSCAD",
+    "/usr/bin/openscad",
+    "/usr/local/bin/openscad",
+    "/snap/bin/openscad",
+    "/var/lib/flatpak/exports/bin/org.openscad.OpenSCAD",
+]
+openscad_found = {}
+
 def debugprint(info):
     if debug_trace:
         print(info)
@@ -12,10 +41,14 @@ def box(width, height, depth):
 
 
 def cylinder(radius, height, segments=100):
+    if max_segments is not None:
+        segments = min(segments, max_segments)
     return sl.cylinder(r=radius, h=height, segments=segments, center=True)
 
 
 def sphere(radius):
+    if max_segments is not None:
+        return sl.sphere(radius, segments=max_segments)
     return sl.sphere(radius)
 
 
@@ -24,13 +57,23 @@ def cone(r1, r2, height):
 
 
 def rotate(shape, angle):
+    if isinstance(shape, MatrixProbe):
+        return MatrixProbe(rotation_matrix(angle) @ shape.matrix)
     return sl.rotate(angle)(shape)
 
 
 def translate(shape, vector):
+    if isinstance(shape, MatrixProbe):
+        return MatrixProbe(translation_matrix(vector) @ shape.matrix)
     return sl.translate(tuple(vector))(shape)
 
 
+def transform(shape, matrix):
+    if isinstance(shape, MatrixProbe):
+        return MatrixProbe(matrix @ shape.matrix)
+    return sl.multmatrix(m=[[float(value) for value in row] for row in matrix])(shape)
+
+
 def mirror(shape, plane=None):
     debugprint('mirror()')
     planes = {
@@ -136,18 +179,192 @@ def extrude_poly(outer_poly, inner_polys=None, height=1):
 
 def import_file(fname, convexity=4):
     full_name = fname + r".stl"
+    if proxy_imports:
+        return import_proxy(full_name)
     print("IMPORTING FROM {}".format(full_name))
 
     return sl.import_stl(full_name, convexity=convexity)
 
 
+def import_proxy(full_name):
+    # preview stand in for an imported part, a cube over its bounds
+    key = (os.path.abspath(full_name), os.path.getmtime(full_name))
+    if key not in part_bounds:
+        part_bounds[key] = stl_bounds(full_name)
+    xmin, ymin, zmin, xmax, ymax, zmax = part_bounds[key]
+    print("IMPORTING PROXY FOR {}".format(full_name))
+    shape = box(xmax - xmin, ymax - ymin, zmax - zmin)
+    return translate(shape, ((xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2))
+
+
+def save_shape(shape, fname):
+    # pickled solid tree for the stage cache
+    with open(fname + ".pickle", mode='wb') as fid:
+        pickle.dump(shape, fid)
+
+
+def load_shape(fname):
+    with open(fname + ".pickle", mode='rb') as fid:
+        return pickle.load(fid)
+
+
+def shape_counts(shape):
+    # faces are only known once OpenSCAD renders, the trace gets the size of the solid tree instead
+    nodes = 0
+    pending = list(shape) if isinstance(shape, (tuple, list)) else [shape]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, sl.OpenSCADObject):
+            nodes += 1
+            pending += item.children
+    return {"nodes": nodes}
+
+
+def modules_supported():
+    # the module writer renders single nodes with a private solidpython method (solidpython is pinned in
+    # environment.yml), a solidpython without it gets the plain render
+    return hasattr(sl.OpenSCADObject, "_render_str_no_children") and hasattr(sl, "IncludedOpenSCADObject")
+
+
+def node_call(item):
+    # the node's own call without its children, e.g. translate(v = [1, 2, 3])
+    return item._render_str_no_children().lstrip("\n")
+
+
+def indent(text):
+    return text.replace("\n", "\n\t")
+
+
+def module_tree(shape):
+    # every distinct subtree gets an id, keyed by its own call and the ids of its children, so a key plate or web
+    # post placed forty times is one entry however many python objects hold it
+    ids = {}
+    nodes = []  # per id: call text, child ids, count of references from distinct parents
+    seen = {}
+
+    def visit(item):
+        if id(item) in seen:
+            return seen[id(item)]
+        child_ids = tuple(visit(child) for child in item.children)
+        call = node_call(item)
+        key = (call, child_ids)
+        if key not in ids:
+            ids[key] = len(nodes)
+            nodes.append([call, child_ids, 0])
+            for child_id in child_ids:
+                nodes[child_id][2] += 1
+        seen[id(item)] = ids[key]
+        return ids[key]
+
+    return visit(shape), nodes
+
+
+def scad_with_modules(shape):
+    # a subtree referenced from more than one place is written once as a module and called where it is used,
+    # OpenSCAD parses it once and caches its geometry
+    root, nodes = module_tree(shape)
+    modules = [i for i, (call, child_ids, refs) in enumerate(nodes) if refs > 1 and child_ids]
+    names = {i: "shape_{}".format(count) for count, i in enumerate(modules)}
+
+    def body(i):
+        call, child_ids, refs = nodes[i]
+        if not child_ids:
+            return call + ";"
+        return call + " {" + indent("".join("\n" + use(child_id) for child_id in child_ids)) + "\n}"
+
+    def use(i):
+        return names[i] + "();" if i in names else body(i)
+
+    # children first, the ids were handed out bottom up
+    definitions = ["module {}() {{{}\n}}\n".format(names[i], indent("\n" + body(i))) for i in modules]
+    return "".join(definitions) + "\n" + use(root) + "\n"
+
+
+def plain_tree(shape):
+    # holes, parts and included .scad files need solidpython's own render
+    pending = [shape]
+    while pending:
+        item = pending.pop()
+        if item.is_hole or item.is_part_root or isinstance(item, sl.IncludedOpenSCADObject):
+            return True
+        pending += item.children
+    return False
+
+
 def export_file(shape, fname):
     print("EXPORTING TO {}".format(fname))
-    sl.scad_render_to_file(shape, fname + ".scad")
+    file_header = "$fn = {};".format(max_segments) if max_segments is not None else ""
+    if not scad_modules or not modules_supported() or plain_tree(shape):
+        sl.scad_render_to_file(shape, fname + ".scad", file_header=file_header)
+        return
+    with open(fname + ".scad", mode='w') as fid:
+        fid.write("// Generated by SolidPython with shared modules\n")
+        if file_header:
+            fid.write(file_header + "\n")
+        fid.write(scad_with_modules(shape))
 
 def export_stl(shape, fname):
     print("EXPORTING STL TO {}".format(fname))
-    run(["C:\\Program Files\\OpenSCAD\\openscad.com", "-o",  fname + "_openscad.stl", fname + ".scad"])
+    render_stl(fname)
+
+
+def find_openscad():
+    for item in [openscad_path, os.environ.get("OPENSCAD"), shutil.which("openscad"), shutil.which("openscad-nightly")]:
+        if item and os.path.isfile(item):
+            return item
+    for item in openscad_locations:
+        if os.path.isfile(item):
+            return item
+    return None
+
+
+def openscad_command():
+    # binary and backend arguments.  the binary is looked up for the current settings on every call, the
+    # --help probe of each binary is kept for the process.
+    binary = find_openscad()
+    if binary is None:
+        return None
+    key = (binary, render_backend)
+    if key not in openscad_found:
+        command = [binary]
+        if render_backend != 'cgal':
+            # recent builds take --backend, 2023 / 2024 snapshots enable manifold as an experimental feature
+            help_text = run([binary, "--help"], stdout=PIPE, stderr=STDOUT).stdout.decode(errors='ignore')
+            if "--backend" in help_text:
+                command.append("--backend=manifold")
+            elif "manifold" in help_text:
+                command.append("--enable=manifold")
+            elif render_backend == 'manifold':
+                print("OPENSCAD AT {} HAS NO MANIFOLD BACKEND, RENDERING WITH CGAL".format(binary))
+        openscad_found[key] = command
+    return openscad_found[key]
+
+
+def render_stl(fname):
+    # <fname>.scad to <fname>_openscad.stl, returns the render time in seconds or None when it failed
+    command = openscad_command()
+    if command is None:
+        print("OPENSCAD NOT FOUND, SET openscad_binary OR THE OPENSCAD ENVIRONMENT VARIABLE")
+        return None
+    start = time.perf_counter()
+    result = run(command + ["-o", fname + "_openscad.stl", fname + ".scad"], stdout=PIPE, stderr=STDOUT)
+    seconds = round(time.perf_counter() - start, 4)
+    if result.returncode != 0:
+        print("RENDER FAILED FOR {}".format(fname))
+        print(result.stdout.decode(errors='ignore'))
+        return None
+    print("RENDERED {}_openscad.stl IN {:.2f}s".format(fname, seconds))
+    return seconds
+
+
+def render_stls(fnames):
+    # each render is its own OpenSCAD process, threads only wait on them
+    if openscad_command() is None:
+        print("OPENSCAD NOT FOUND, SET openscad_binary OR THE OPENSCAD ENVIRONMENT VARIABLE")
+        return {}
+    workers = render_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(workers, max(len(fnames), 1))) as pool:
+        return dict(zip(fnames, pool.map(render_stl, fnames)))
 
 
 def export_dxf(shape, fname):
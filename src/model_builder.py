@@ -1,7 +1,7 @@
 import os
 import copy
-import importlib
 from generate_configuration import *
+from build_pool import BuildJob, run_jobs
 
 
 base = shape_config
@@ -79,30 +79,58 @@ def create_config(config_options):
 
 
 
-def build_release(base, configurations, engines=('solid', 'cadquery')):
-    init = True
+def release_jobs(base, configurations, engines=('solid', 'cadquery'), release_dir="things"):
+    # one independent job per configuration and engine, each with its complete config in memory
+    jobs = []
     for config in configurations:
         shape_config = copy.deepcopy(base)
         for item in config:
             shape_config[item] = config[item]
-    
+        shape_config['overrides'] = ""
+        shape_config['save_dir'] = os.path.join(release_dir, config['save_dir'])
+
         for engine in engines:
-            shape_config['ENGINE'] = engine
-            with open('run_config.json', mode='w') as fid:
-                json.dump(shape_config, fid, indent=4)
-    
-            if init:
-                import dactyl_manuform as dactyl_manuform
-                dactyl_manuform.run()
-                init = False
-            else:
-                importlib.reload(dactyl_manuform)
-                dactyl_manuform.run()
+            engine_config = copy.deepcopy(shape_config)
+            engine_config['ENGINE'] = engine
+            name = config['config_name'] + "_" + engine
+            # the engines of a configuration share its directory, each writes and lists only its own files
+            engine_config['save_name'] = name
+            jobs.append(BuildJob(name, engine_config, log_file=os.path.join(release_dir, "logs", name + ".log")))
+
+    return jobs
+
+
+def build_release(base, configurations, engines=('solid', 'cadquery'), release_dir="things", workers=None,
+                  timeout=None, retries=0):
+    jobs = release_jobs(base, configurations, engines, release_dir)
+    os.makedirs(release_dir, exist_ok=True)
+    return run_jobs(
+        jobs, workers=workers, manifest_file=os.path.join(release_dir, "release_manifest.json"),
+        timeout=timeout, retries=retries
+    )
+
 
 if __name__ == '__main__':
+    # run from the repository root: python src/model_builder.py [--jobs=N] [--timeout=seconds] [--retries=N]
+    opts, args = getopt.getopt(sys.argv[1:], "", ["jobs=", "timeout=", "retries=", "release_dir="])
+    workers = None
+    timeout = None
+    retries = 1
+    release_dir = "things"
+    for opt, arg in opts:
+        if opt in '--jobs':
+            workers = int(arg)
+        elif opt in '--timeout':
+            timeout = float(arg)
+        elif opt in '--retries':
+            retries = int(arg)
+        elif opt in '--release_dir':
+            release_dir = arg
+
     configurations = create_config(config_options)
 
     ENGINES = ['solid', 'cadquery']
     # ENGINES = ['solid']
 
-    build_release(base, configurations, ENGINES)
+    manifest = build_release(base, configurations, ENGINES, release_dir, workers, timeout, retries)
+    print("RELEASE DONE: {} ok, {} failed".format(manifest["ok"], manifest["failed"]))
@@ -0,0 +1,138 @@
+import ast
+import hashlib
+import json
+import os
+
+
+def hash_files(file_names):
+    # contents of source / json files, so editing the code invalidates the stages built with it
+    digest = hashlib.sha1()
+    for file_name in sorted(set(file_names)):
+        digest.update(os.path.basename(file_name).encode())
+        with open(file_name, mode='rb') as fid:
+            digest.update(fid.read())
+    return digest.hexdigest()
+
+
+def imported_files(file_names, root):
+    # the source files and every module under root they import, directly or through each other, so a change to
+    # any code a stage runs invalidates it
+    found = []
+    pending = [os.path.abspath(file_name) for file_name in file_names]
+    while pending:
+        file_name = pending.pop()
+        if file_name in found:
+            continue
+        found.append(file_name)
+        with open(file_name, mode='r') as fid:
+            tree = ast.parse(fid.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module_path = os.path.join(os.path.abspath(root), *name.split("."))
+                for candidate in [module_path + ".py", os.path.join(module_path, "__init__.py")]:
+                    if os.path.isfile(candidate):
+                        pending.append(candidate)
+    return sorted(found)
+
+
+def stat_files(dir_name):
+    # name, size and mtime only, the part files are too large to read on every build
+    stats = []
+    for file_name in sorted(os.listdir(dir_name)):
+        full_name = os.path.join(dir_name, file_name)
+        if os.path.isfile(full_name):
+            info = os.stat(full_name)
+            stats.append([file_name, info.st_size, info.st_mtime])
+    return stats
+
+
+# Content addressed on-disk cache of model_side stages.  A stage is stored under a hash of the config
+# settings it reads, the code it runs and any extra values (side, cluster, ...).  Only those settings are
+# hashed, so changing an unrelated setting reuses the stored shape instead of rebuilding it.
+class StageCache(object):
+    def __init__(self, cache_dir, settings, save_shape, load_shape, enabled=True):
+        self.cache_dir = cache_dir
+        self.settings = settings
+        self.save_shape = save_shape
+        self.load_shape = load_shape
+        self.enabled = enabled
+        self.code_versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def code_version(self, code_files):
+        code_files = tuple(sorted(set(code_files)))
+        if code_files not in self.code_versions:
+            self.code_versions[code_files] = hash_files(code_files)
+        return self.code_versions[code_files]
+
+    def key(self, stage, fields, code_files, extra=None):
+        values = {}
+        for field in sorted(set(fields)):
+            values[field] = self.settings.get(field)
+        payload = json.dumps(
+            [stage, values, self.code_version(code_files), extra], sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def fetch(self, stage, fields, code_files, builder, extra=None):
+        if not self.enabled:
+            return builder()
+
+        fname = os.path.join(self.cache_dir, stage + "_" + self.key(stage, fields, code_files, extra))
+        shape = self.load(fname)
+        if shape is not None:
+            print("STAGE CACHE HIT: {}".format(stage))
+            self.hits += 1
+            return shape
+
+        self.misses += 1
+        shape = builder()
+        self.save(fname, shape)
+        return shape
+
+    def load(self, fname):
+        if not os.path.exists(fname + ".json"):
+            return None
+        try:
+            with open(fname + ".json", mode='r') as fid:
+                manifest = json.load(fid)
+            shapes = [
+                None if i in manifest["missing"] else self.load_shape(fname + "_" + str(i))
+                for i in range(manifest["count"])
+            ]
+        except Exception as err:
+            print("STAGE CACHE: could not load {}, rebuilding ({})".format(fname, err))
+            return None
+
+        if manifest["tuple"]:
+            return tuple(shapes)
+        return shapes[0]
+
+    def save(self, fname, shape):
+        # shapes are written to a directory of this process and moved in, parallel builds can share a cache
+        temp_dir = os.path.join(self.cache_dir, "tmp_" + str(os.getpid()))
+        os.makedirs(temp_dir, exist_ok=True)
+        temp_name = os.path.join(temp_dir, os.path.basename(fname))
+
+        is_tuple = isinstance(shape, (tuple, list))
+        shapes = list(shape) if is_tuple else [shape]
+        missing = []
+        for i, item in enumerate(shapes):
+            if item is None:
+                missing.append(i)
+                continue
+            self.save_shape(item, temp_name + "_" + str(i))
+
+        # manifest goes last, a stage only counts as cached once all of its shapes are written
+        with open(temp_name + ".json", mode='w') as fid:
+            json.dump({"count": len(shapes), "tuple": is_tuple, "missing": missing}, fid)
+        for file_name in sorted(os.listdir(temp_dir), key=lambda name: name.endswith(".json")):
+            os.replace(os.path.join(temp_dir, file_name), os.path.join(self.cache_dir, file_name))
+        os.rmdir(temp_dir)
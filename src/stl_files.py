@@ -0,0 +1,41 @@
+import numpy as np
+
+
+# binary STL: 80 byte header, triangle count, then 50 byte records of normal, 3 vertices and an attribute
+stl_record = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+
+
+def read_stl(full_name):
+    # triangles of a binary or ascii STL file, shape (n, 3, 3)
+    with open(full_name, mode='rb') as fid:
+        data = fid.read()
+    count = int(np.frombuffer(data[80:84], dtype='<u4')[0]) if len(data) >= 84 else 0
+    if len(data) == 84 + stl_record.itemsize * count:
+        return np.frombuffer(data[84:], dtype=stl_record)['vertices'].astype(float)
+
+    points = [
+        [float(value) for value in line.split()[1:4]]
+        for line in data.decode(errors='ignore').splitlines() if line.strip().startswith('vertex')
+    ]
+    return np.array(points, dtype=float).reshape(-1, 3, 3)
+
+
+def write_stl(fname, vertices, triangles):
+    # binary STL of an indexed mesh, vertices (n, 3) and triangles (m, 3) of vertex indices
+    corners = np.asarray(vertices, dtype=float)[np.asarray(triangles, dtype=np.int64)]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    normals[lengths > 0] /= lengths[lengths > 0, None]
+
+    records = np.zeros(len(corners), dtype=stl_record)
+    records['normal'] = normals
+    records['vertices'] = corners
+    with open(fname, mode='wb') as fid:
+        fid.write(b'dactyl-keyboard'.ljust(80, b' '))
+        fid.write(np.array([len(records)], dtype='<u4').tobytes())
+        fid.write(records.tobytes())
+
+
+def stl_bounds(full_name):
+    points = read_stl(full_name).reshape(-1, 3)
+    return [float(value) for value in [*points.min(axis=0), *points.max(axis=0)]]
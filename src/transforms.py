@@ -0,0 +1,60 @@
+import numpy as np
+
+
+# 4x4 homogeneous transform matrices, applied to column vectors: matrix @ [x, y, z, 1]
+
+def identity_matrix():
+    return np.identity(4)
+
+
+def rotation_matrix(angle):
+    # same order as the rotate() helpers: about X, then Y, then Z, angles in degrees
+    ax, ay, az = np.radians(angle[0]), np.radians(angle[1]), np.radians(angle[2])
+    rot_x = np.array([
+        [1, 0, 0, 0],
+        [0, np.cos(ax), -np.sin(ax), 0],
+        [0, np.sin(ax), np.cos(ax), 0],
+        [0, 0, 0, 1],
+    ])
+    rot_y = np.array([
+        [np.cos(ay), 0, np.sin(ay), 0],
+        [0, 1, 0, 0],
+        [-np.sin(ay), 0, np.cos(ay), 0],
+        [0, 0, 0, 1],
+    ])
+    rot_z = np.array([
+        [np.cos(az), -np.sin(az), 0, 0],
+        [np.sin(az), np.cos(az), 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 1],
+    ])
+    return rot_z @ rot_y @ rot_x
+
+
+def translation_matrix(vector):
+    matrix = np.identity(4)
+    matrix[:3, 3] = vector[:3]
+    return matrix
+
+
+def transform_points(matrix, points):
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def transform_point(matrix, point):
+    return list(transform_points(matrix, [point])[0])
+
+
+def orthonormalize(matrix):
+    # long chains of products drift away from a pure rotation, OCC refuses scaled locations
+    u, s, vt = np.linalg.svd(matrix[:3, :3])
+    matrix = np.array(matrix, dtype=float)
+    matrix[:3, :3] = u @ vt
+    return matrix
+
+
+# stands in for a shape to record what a chain of rotate / translate helper calls does to it
+class MatrixProbe(object):
+    def __init__(self, matrix=None):
+        self.matrix = np.identity(4) if matrix is None else matrix